@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+import requests
+import time
+from api_client import api_client
+from job_waiter import CONNECTION_ERRORS, _call, _receive, _send, connect, websocket
+from uuid import uuid4
+
+
+def degraded_pool(pool):
+    """
+    Return a match for the critical alert of pool in DEGRADED state.
+    """
+    def match(alert):
+        return alert.get('level') == 'CRITICAL' and f'Pool {pool} state is DEGRADED' in alert.get('formatted', '')
+    return match
+
+
+def _active(alerts, match):
+    return [alert for alert in alerts.values() if not alert.get('dismissed') and match(alert)]
+
+
+def _watch_on_websocket(hostname, auth, match, present, timeout, url=None):
+    connection = connect(hostname, auth, url)
+    try:
+        # subscribe before listing, an alert can change between the two
+        _send(connection, {'id': str(uuid4()), 'name': 'alert.list', 'msg': 'sub'})
+        list_id = _call(connection, 'alert.list')
+        alerts = None
+        deadline = time.time() + timeout
+        while True:
+            if alerts is not None and bool(_active(alerts, match)) == present:
+                return {'result': True, 'alerts': _active(alerts, match)}
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return {'result': False, 'alerts': _active(alerts or {}, match)}
+            connection.settimeout(remaining)
+            try:
+                message = _receive(connection)
+            except websocket.WebSocketTimeoutException:
+                return {'result': False, 'alerts': _active(alerts or {}, match)}
+            if message.get('msg') == 'result' and message.get('id') == list_id:
+                alerts = {alert['uuid']: alert for alert in message.get('result') or []}
+            elif message.get('collection') == 'alert.list' and alerts is not None:
+                if message.get('msg') == 'removed':
+                    alerts.pop(message.get('id'), None)
+                elif message.get('msg') in ('added', 'changed'):
+                    alerts.setdefault(message.get('id'), {'uuid': message.get('id')}).update(message.get('fields') or {})
+    finally:
+        connection.close()
+
+
+def _watch_on_rest(hostname, auth, match, present, timeout, interval=5):
+    deadline = time.time() + timeout
+    active = []
+    while True:
+        try:
+            results = api_client(hostname).get('alert/list/', auth)
+        except requests.RequestException:
+            results = None
+        if results is not None and results.status_code == 200:
+            active = _active({alert['uuid']: alert for alert in results.json()}, match)
+            if bool(active) == present:
+                return {'result': True, 'alerts': active}
+        if time.time() + interval > deadline:
+            return {'result': False, 'alerts': active}
+        time.sleep(interval)
+
+
+def wait_for_alert(hostname, auth, match, present=True, timeout=900, url=None):
+    """
+    Wait until an alert matching match(alert) is active, or until none is
+    with present=False, on the alert.list subscription of the middleware.
+    Return {'result', 'alerts'} with the matching alerts.
+    """
+    deadline = time.time() + timeout
+    try:
+        return _watch_on_websocket(hostname, auth, match, present, timeout, url)
+    except CONNECTION_ERRORS:
+        # like during a failover, poll the REST API instead
+        return _watch_on_rest(hostname, auth, match, present, max(deadline - time.time(), 0))
+
+
+def dismiss_all_alerts(hostname, auth):
+    """
+    Dismiss every active alert and return the uuid of those that failed.
+    """
+    failed = []
+    for alert in api_client(hostname).get('alert/list/', auth).json():
+        if not alert.get('dismissed'):
+            results = api_client(hostname).post('alert/dismiss/', auth, alert['uuid'])
+            if results.status_code != 200:
+                failed.append(alert['uuid'])
+    return failed
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import requests
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+header = {'Content-Type': 'application/json', 'Vary': 'accept'}
+
+
+class RestClient:
+    """
+    Keep-alive client for http://<host>/api/v2.0 with pooled connections,
+    timeouts, bounded retries and latency stats per endpoint.
+    """
+
+    def __init__(self, host, timeout=(10, 120), retries=3, pool_size=10):
+        self.host = host
+        self.timeout = timeout
+        self.latency = {}
+        # connection errors are retried for every method, read errors like a
+        # connection reset during failover only for the idempotent ones.
+        retry = Retry(total=retries, connect=retries, read=retries, backoff_factor=0.5)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update(header)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def request(self, method, api_path, auth, payload=None):
+        start = time.time()
+        try:
+            return self.session.request(
+                method,
+                f'http://{self.host}/api/v2.0/{api_path}',
+                auth=auth,
+                data=json.dumps(payload) if payload else None,
+                timeout=self.timeout
+            )
+        finally:
+            endpoint = f"{method} /{api_path.split('?')[0].strip('/')}"
+            self.latency.setdefault(endpoint, []).append(time.time() - start)
+
+    def get(self, api_path, auth):
+        return self.request('GET', api_path, auth)
+
+    def post(self, api_path, auth, payload=None):
+        return self.request('POST', api_path, auth, payload)
+
+    def put(self, api_path, auth, payload=None):
+        return self.request('PUT', api_path, auth, payload)
+
+    def delete(self, api_path, auth, payload=None):
+        return self.request('DELETE', api_path, auth, payload)
+
+    def close(self):
+        self.session.close()
+
+
+clients = {}
+
+
+def api_client(host):
+    """
+    Return the shared RestClient for host, API_TIMEOUT and API_RETRIES
+    change the read timeout in seconds and the number of retries.
+    """
+    if host not in clients:
+        clients[host] = RestClient(
+            host,
+            timeout=(10, float(os.environ.get('API_TIMEOUT', 120))),
+            retries=int(os.environ.get('API_RETRIES', 3))
+        )
+    return clients[host]
+
+
+def latency_stats():
+    """
+    Return {endpoint: {calls, total, p50, max}} for every client.
+    """
+    stats = {}
+    for client in clients.values():
+        for endpoint, durations in client.latency.items():
+            durations = sorted(durations)
+            stats[f'{client.host} {endpoint}'] = {
+                'calls': len(durations),
+                'total': sum(durations),
+                'p50': durations[len(durations) // 2],
+                'max': durations[-1]
+            }
+    return stats
+
+
+def latency_summary(top=10):
+    stats = sorted(latency_stats().items(), key=lambda item: item[1]['total'], reverse=True)
+    lines = [f'API calls by total time (top {top}):']
+    for endpoint, stat in stats[:top]:
+        lines.append(
+            f"  {endpoint}: {stat['calls']} calls, total {stat['total']:.1f}s, "
+            f"p50 {stat['p50'] * 1000:.0f}ms, max {stat['max'] * 1000:.0f}ms"
+        )
+    return lines
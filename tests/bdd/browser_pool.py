@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import WebDriverException
+
+
+def _quit_started(future):
+    if future.exception() is None:
+        future.result().quit()
+
+
+class BrowserPool:
+    """
+    Start a browser with factory() only when a test asks for one, or ahead
+    of time in the background with prewarm(). A browser that crashed is
+    replaced by the next one between two tests.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.current = None
+        self.warm = []
+        self.uses = 0
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def prewarm(self, count):
+        """
+        Start count browsers in the background for the next get() calls.
+        """
+        if count <= 0:
+            return
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=count, thread_name_prefix='browser')
+        self.warm += [self.executor.submit(self.factory) for _ in range(count)]
+
+    def _next(self):
+        while self.warm:
+            future = self.warm.pop(0)
+            try:
+                return future.result()
+            except (WebDriverException, OSError) as error:
+                print(f'a pre-warmed browser did not start: {error}')
+        return self.factory()
+
+    def get(self):
+        with self.lock:
+            if self.current is None:
+                self.current = self._next()
+            return self.current
+
+    @staticmethod
+    def alive(driver):
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def check(self, recycle_after=0):
+        """
+        Called between two tests, drop the browser if it is not answering
+        anymore or after recycle_after tests, the next get() starts or takes
+        a pre-warmed one.
+        """
+        if self.current is None:
+            return
+        self.uses += 1
+        if not self.alive(self.current) or (recycle_after and self.uses >= recycle_after):
+            self.discard()
+
+    def discard(self):
+        with self.lock:
+            driver, self.current, self.uses = self.current, None, 0
+        if driver is not None:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+
+    def quit_idle(self):
+        """
+        Quit the pre-warmed browsers no test used.
+        """
+        for future in self.warm:
+            future.add_done_callback(_quit_started)
+        self.warm = []
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+
+import functools
+import json
+import os
+import threading
+import time
+from dom_snapshot import snapshot_name
+
+# the sleep before install() replaced it
+_sleep = time.sleep
+
+
+def _selector(params):
+    """
+    Return the XPath of a find command, or the first argument of the
+    scripts of the wait and probe helpers which is their XPath.
+    """
+    params = params or {}
+    if params.get('using') and isinstance(params.get('value'), str):
+        return params['value']
+    for argument in params.get('args') or []:
+        if isinstance(argument, str) and argument.lstrip('(').startswith('//'):
+            return argument
+    return None
+
+
+def _endpoint(client, method, api_path, *args, **kwargs):
+    return f"{method} /{api_path.split('?')[0].strip('/')}"
+
+
+def _command(pool, command, *args, **kwargs):
+    # run_batch gets a list of commands
+    return (command if isinstance(command, str) else '; '.join(command))[:200]
+
+
+def _not_found(response):
+    value = response.get('value') if isinstance(response, dict) else None
+    return isinstance(value, dict) and value.get('error') == 'no such element'
+
+
+class CommandTracer:
+    """
+    Time the WebDriver commands, REST calls, ssh and shell commands and the
+    sleeps of the main thread by pytest-bdd step. Each scenario is written
+    as a Chrome trace (chrome://tracing, Perfetto) in results/traces and
+    the hot spots of the run are summed up at the end.
+    """
+
+    def __init__(self, directory='results/traces'):
+        self.directory = directory
+        self.enabled = False
+        self.scenario = None
+        self.step = None
+        self.step_start = None
+        self.origin = 0
+        self.events = []
+        self.depth = 0
+        self.steps = {}
+        self.selectors = {}
+        self.categories = {}
+
+    def install(self):
+        """
+        Wrap the REST client, the ssh pool, run_cmd and time.sleep, the
+        drivers are wrapped by watch().
+        """
+        import function
+        from api_client import RestClient
+        from ssh_pool import SSHPool
+        self.enabled = True
+        RestClient.request = self.traced('rest', RestClient.request, _endpoint)
+        for method in ('run', 'run_batch'):
+            setattr(SSHPool, method, self.traced('ssh', getattr(SSHPool, method), _command))
+        function.run_cmd = self.traced('shell', function.run_cmd, lambda command: command[:200])
+        time.sleep = self.traced('sleep', _sleep, lambda seconds: f'sleep {seconds}s')
+
+    def watch(self, driver):
+        """
+        Time the commands driver sends, return driver.
+        """
+        executor = getattr(driver, 'command_executor', None)
+        if not self.enabled or executor is None or getattr(executor, 'traced', False):
+            return driver
+        execute = executor.execute
+
+        def traced_execute(command, params=None):
+            if threading.current_thread() is not threading.main_thread():
+                return execute(command, params)
+            start = time.time()
+            response = None
+            self.depth += 1
+            try:
+                response = execute(command, params)
+                return response
+            finally:
+                self.depth -= 1
+                # a find that found nothing waited for the implicit wait
+                category = 'implicit_wait' if _not_found(response) else 'webdriver'
+                self.record(category, command, start, time.time(), _selector(params))
+        executor.execute = traced_execute
+        executor.traced = True
+        return driver
+
+    def traced(self, category, function, name):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if threading.current_thread() is not threading.main_thread():
+                return function(*args, **kwargs)
+            start = time.time()
+            self.depth += 1
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.depth -= 1
+                self.record(category, name(*args, **kwargs), start, time.time())
+        return wrapper
+
+    def record(self, category, name, start, end, selector=None):
+        if self.scenario is None:
+            return
+        seconds = end - start
+        args = {'step': self.step}
+        if selector:
+            args['selector'] = selector
+        self.events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round((start - self.origin) * 1e6),
+            'dur': round(seconds * 1e6),
+            'pid': 1,
+            'tid': 1,
+            'args': args
+        })
+        # a sleep or ssh command inside another traced call is only in the trace
+        if self.depth:
+            return
+        total = self.categories.setdefault(category, {'calls': 0, 'seconds': 0.0})
+        total['calls'] += 1
+        total['seconds'] += seconds
+        step = self.steps.setdefault(f'{self.scenario} :: {self.step}', {'seconds': 0.0, 'round_trips': 0, 'calls': 0})
+        step['calls'] += 1
+        if category in ('webdriver', 'implicit_wait'):
+            step['round_trips'] += 1
+        if selector:
+            lookup = self.selectors.setdefault(selector, {'calls': 0, 'seconds': 0.0})
+            lookup['calls'] += 1
+            lookup['seconds'] += seconds
+
+    def start_scenario(self, name):
+        self.scenario = name
+        self.step = None
+        self.origin = time.time()
+        self.events = []
+
+    def start_step(self, name):
+        self.step = name
+        self.step_start = time.time()
+
+    def end_step(self, failed=False):
+        if self.scenario is None or self.step is None or self.step_start is None:
+            return
+        end = time.time()
+        self.events.append({
+            'name': self.step,
+            'cat': 'step',
+            'ph': 'X',
+            'ts': round((self.step_start - self.origin) * 1e6),
+            'dur': round((end - self.step_start) * 1e6),
+            'pid': 1,
+            'tid': 1,
+            'args': {'failed': failed}
+        })
+        self.steps.setdefault(f'{self.scenario} :: {self.step}', {'seconds': 0.0, 'round_trips': 0, 'calls': 0})['seconds'] += end - self.step_start
+        self.step = None
+        self.step_start = None
+
+    def end_scenario(self):
+        """
+        Write the trace of the scenario and return its path.
+        """
+        if self.scenario is None:
+            return None
+        self.end_step()
+        os.makedirs(self.directory, exist_ok=True)
+        path = f'{self.directory}/{snapshot_name(self.scenario)}.json'
+        with open(path, 'w') as outfile:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, outfile)
+        self.scenario = None
+        self.events = []
+        return path
+
+    def hot_spots(self, top=10):
+        """
+        Return the lines of the slowest steps and selectors and the time by
+        category, saved in hot_spots.json too.
+        """
+        steps = sorted(self.steps.items(), key=lambda item: item[1]['seconds'], reverse=True)
+        selectors = sorted(self.selectors.items(), key=lambda item: item[1]['seconds'], reverse=True)
+        round_trips = sum(step['round_trips'] for step in self.steps.values())
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f'{self.directory}/hot_spots.json', 'w') as outfile:
+            json.dump({'steps': dict(steps), 'selectors': dict(selectors), 'categories': self.categories, 'round_trips': round_trips}, outfile, indent=2)
+        lines = [f'WebDriver round-trips: {round_trips}, time by kind of call:']
+        for category, total in sorted(self.categories.items(), key=lambda item: item[1]['seconds'], reverse=True):
+            lines.append(f"  {category}: {total['calls']} calls, {total['seconds']:.1f}s")
+        lines.append(f'steps by total time (top {top}):')
+        for name, step in steps[:top]:
+            lines.append(f"  {step['seconds']:.1f}s, {step['round_trips']} round-trips: {name}")
+        lines.append(f'selectors by total time (top {top}):')
+        for selector, lookup in selectors[:top]:
+            lines.append(f"  {lookup['seconds']:.1f}s, {lookup['calls']} calls: {selector}")
+        return lines
+
+
+command_tracer = CommandTracer()
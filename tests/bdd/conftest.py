@@ -1,10 +1,18 @@
 # !/usr/bin/env python3
 
+import json
 import os
 import pytest
 import time
 import xpaths
+from api_client import latency_summary
+from browser_pool import BrowserPool
+from command_tracer import command_tracer
 from configparser import ConfigParser
+from functools import cached_property, lru_cache
+from dom_probe import IMPLICIT_WAIT, probe, probe_summary
+from dom_snapshot import save_step_snapshot, step_snapshots
+from failover_phases import failover_tracker
 from function import (
     is_element_present,
     wait_on_element,
@@ -12,10 +20,12 @@ from function import (
     post
 )
 from platform import system
+from pytest_dependency import DependencyItemStatus, DependencyManager
+from scheduler import dependency_graph, scan_dependencies, topological_order
 from selenium import webdriver
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+from selenium.webdriver.firefox.options import Options
 from selenium.common.exceptions import ElementClickInterceptedException
 
 # To avoid hostname need to be unique so using the PID should avoid this
@@ -66,8 +76,32 @@ def iso_version():
         return 'none'
 
 
-def browser():
-    profile = webdriver.FirefoxProfile()
+# the transitions and animations of the web UI end right away, like with
+# duration 0 the transitionend and animationend events still fire
+FAST_PROFILE_CSS = """
+*, *::before, *::after {
+    transition-duration: 0s !important;
+    transition-delay: 0s !important;
+    animation-duration: 0s !important;
+    animation-delay: 0s !important;
+    scroll-behavior: auto !important;
+}
+"""
+
+
+class SessionProfile(webdriver.FirefoxProfile):
+    # the options zip and encode the profile for every new session, it is
+    # the same for all the browsers of the session
+    encoded = cached_property(webdriver.FirefoxProfile.encoded.fget)
+
+
+@lru_cache(maxsize=None)
+def firefox_profile(fast=False):
+    """
+    The profile of the browsers, built and encoded once for the session.
+    With fast the animations, web fonts and images are turned off.
+    """
+    profile = SessionProfile()
     profile.set_preference("browser.download.folderList", 2)
     profile.set_preference("browser.download.dir", "/tmp")
     # this is the place to add file type to autosave
@@ -76,23 +110,57 @@ def browser():
     profile.set_preference("browser.helperApps.neverAsk.saveToDisk", "application/x-tar,application/gzip")
     profile.set_preference("browser.download.manager.showWhenStarting", False)
     profile.set_preference("browser.link.open_newwindow", 3)
+    if fast:
+        profile.set_preference("ui.prefersReducedMotion", 1)
+        profile.set_preference("image.animation_mode", "none")
+        profile.set_preference("permissions.default.image", 2)
+        profile.set_preference("browser.display.use_document_fonts", 0)
+        # load chrome/userContent.css on every page
+        profile.set_preference("toolkit.legacyUserProfileCustomizations.stylesheets", True)
+        os.makedirs(f'{profile.path}/chrome', exist_ok=True)
+        with open(f'{profile.path}/chrome/userContent.css', 'w') as stylesheet:
+            stylesheet.write(FAST_PROFILE_CSS)
+    # encoded before the pre-warmed browsers start in other threads
+    profile.encoded
+    return profile
+
+
+def browser():
+    # BROWSER_PROFILE=fast start a headless browser with the fast profile
+    fast = os.environ.get('BROWSER_PROFILE') == 'fast'
     binary = '/usr/bin/firefox' if system() == "Linux" else '/usr/local/bin/firefox'
-    firefox_capabilities = DesiredCapabilities.FIREFOX
-    firefox_capabilities['marionette'] = True
-    firefox_capabilities['firefox_profile'] = profile.encoded
-    firefox_capabilities['binary'] = binary
-    web_driver = webdriver.Firefox(capabilities=firefox_capabilities)
+    # selenium 4 drops the firefox_profile capability, the profile is only
+    # sent through the options
+    options = Options()
+    options.binary_location = binary
+    options.profile = firefox_profile(fast)
+    if fast:
+        options.add_argument('-headless')
+    web_driver = webdriver.Firefox(options=options)
     web_driver.set_window_size(1920, 1080)
-    web_driver.implicitly_wait(2)
+    web_driver.implicitly_wait(IMPLICIT_WAIT)
     return web_driver
 
 
-web_driver = browser()
+# DOM_SNAPSHOTS=capture save the DOM after each step, DOM_SNAPSHOTS=replay
+# run the steps on those snapshots without a browser or a NAS.
+if os.environ.get('DOM_SNAPSHOTS') == 'replay':
+    from replay_driver import ReplayDriver
+    browser_pool = BrowserPool(ReplayDriver)
+else:
+    # the browser only starts when a test uses the driver fixture
+    browser_pool = BrowserPool(browser)
+
+
+# TRACE_COMMANDS=1 time the WebDriver commands, REST and ssh calls and the
+# sleeps by step in results/traces, before the tests import run_cmd.
+if os.environ.get('TRACE_COMMANDS'):
+    command_tracer.install()
 
 
 @pytest.fixture
 def driver():
-    return web_driver
+    return command_tracer.watch(browser_pool.get())
 
 
 # Close Firefox after all tests are completed
@@ -100,6 +168,99 @@ def driver():
 #     web_driver.quit()
 
 
+def pytest_sessionstart(session):
+    """
+    Register the dependencies that passed in an earlier runtest.py process
+    and start BROWSER_PREWARM browsers while the tests are collected.
+    """
+    if int(os.environ.get('BROWSER_PREWARM', 0)) and not session.config.option.collectonly:
+        browser_pool.prewarm(int(os.environ.get('BROWSER_PREWARM')))
+    if os.environ.get('SATISFIED_DEPENDENCIES'):
+        manager = DependencyManager('session')
+        for name in os.environ.get('SATISFIED_DEPENDENCIES').split(','):
+            status = manager.results.setdefault(name, DependencyItemStatus())
+            for phase in DependencyItemStatus.Phases:
+                status.results[phase] = 'passed'
+        session.dependencyManager = manager
+
+
+def pytest_collection_modifyitems(session, config, items):
+    """
+    Run the test files in dependency order instead of the file names order.
+    """
+    test_files = list(dict.fromkeys(str(item.fspath) for item in items))
+    order = topological_order(dependency_graph(test_files))
+    items.sort(key=lambda item: order.index(str(item.fspath)))
+
+
+def pytest_runtest_setup(item):
+    """
+    Skip right away when a dependency of the test file did not pass instead
+    of waiting on elements until the depends() call. A browser that crashed
+    in the test before, or used by BROWSER_RECYCLE tests, is replaced.
+    """
+    browser_pool.check(int(os.environ.get('BROWSER_RECYCLE', 0)))
+    if command_tracer.enabled:
+        command_tracer.start_scenario(item.nodeid)
+    manager = getattr(item.session, 'dependencyManager', None)
+    if manager is None:
+        return
+    for name in scan_dependencies(str(item.fspath))['needs']:
+        if name in manager.results and not manager.results[name].isSuccess():
+            pytest.skip(f'{item.name} depends on {name}')
+
+
+def pytest_runtest_teardown(item):
+    if command_tracer.enabled:
+        command_tracer.end_scenario()
+
+
+def pytest_bdd_before_step(request, step):
+    request.node.dom_step = getattr(request.node, 'dom_step', 0) + 1
+    if command_tracer.enabled:
+        command_tracer.start_step(step.name)
+    if os.environ.get('DOM_SNAPSHOTS') == 'replay':
+        snapshots = step_snapshots(request.node.nodeid)
+        browser_pool.get().replay([snapshots.get(request.node.dom_step - 1), snapshots.get(request.node.dom_step)])
+
+
+def pytest_bdd_after_step(request, step):
+    if os.environ.get('DOM_SNAPSHOTS') == 'capture':
+        save_step_snapshot(browser_pool.get(), request.node.nodeid, request.node.dom_step, step.name)
+    if command_tracer.enabled:
+        command_tracer.end_step()
+
+
+def pytest_bdd_step_error(request, step):
+    if command_tracer.enabled:
+        command_tracer.end_step(failed=True)
+
+
+def pytest_terminal_summary(terminalreporter):
+    terminalreporter.write_line(probe_summary())
+    for line in latency_summary():
+        terminalreporter.write_line(line)
+    if command_tracer.enabled:
+        for line in command_tracer.hot_spots():
+            terminalreporter.write_line(line)
+
+
+def pytest_sessionfinish(session):
+    """
+    Save the dependency results for the next runtest.py processes.
+    """
+    # a failover that did not reach services_ready is saved as it is
+    failover_tracker.save()
+    browser_pool.quit_idle()
+    manager = getattr(session, 'dependencyManager', None)
+    if os.environ.get('DEPENDENCY_RESULTS') and manager is not None:
+        results = {'passed': [], 'failed': []}
+        for name, status in manager.results.items():
+            results['passed' if status.isSuccess() else 'failed'].append(name)
+        with open(os.environ.get('DEPENDENCY_RESULTS'), 'w') as outfile:
+            json.dump(results, outfile)
+
+
 @pytest.mark.hookwrapper
 def pytest_runtest_makereport(item):
     """
@@ -107,12 +268,19 @@ def pytest_runtest_makereport(item):
     """
     outcome = yield
     report = outcome.get_result()
+    web_driver = browser_pool.current
+    if web_driver is None:
+        return
     if report.when == 'call' or report.when == "setup":
         xfail = hasattr(report, 'wasxfail')
         if (report.skipped and xfail) or (report.failed and not xfail):
             screenshot_name = f'screenshot/{report.nodeid.partition("[")[0].replace("::", "_")}.png'
+            error_window = probe(web_driver, {
+                'error': '//h1[contains(.,"Error")]',
+                'failed': '//h1[contains(.,"FAILED")]'
+            })
             # look if there is a Error window
-            if is_element_present(web_driver, '//h1[contains(.,"Error")]') or is_element_present(web_driver, '//h1[contains(.,"FAILED")]'):
+            if error_window['error']['present'] or error_window['failed']['present']:
                 web_driver.find_element_by_xpath('//ix-icon[@fonticon="add_circle_outline"]').click()
                 time.sleep(2)
                 traceback_name = f'screenshot/{report.nodeid.partition("[")[0].replace("::", "_")}_error.txt'
@@ -127,10 +295,16 @@ def pytest_runtest_makereport(item):
             # take screenshot after looking for error
             save_screenshot(screenshot_name)
 
-            if is_element_present(web_driver, '//h1[contains(text(),"Installing")]') and is_element_present(web_driver, '//mat-dialog-content[contains(.,"Error:")]'):
+            dialogs = probe(web_driver, {
+                'installing': '//h1[contains(text(),"Installing")]',
+                'dialog_error': '//mat-dialog-content[contains(.,"Error:")]',
+                'close_icon': '//ix-icon[@id="ix-close-icon"]'
+            })
+            if dialogs['installing']['present'] and dialogs['dialog_error']['present']:
                 web_driver.find_element_by_xpath(xpaths.button.close).click()
 
-            if wait_on_element(web_driver, 1, '//ix-icon[@id="ix-close-icon"]', 'clickable'):
+            close_icon = dialogs['close_icon']
+            if (close_icon['visible'] and close_icon['enabled']) or wait_on_element(web_driver, 1, '//ix-icon[@id="ix-close-icon"]', 'clickable'):
                 try:
                     web_driver.find_element_by_xpath('//ix-icon[@id="ix-close-icon"]').click()
                 except ElementClickInterceptedException:
@@ -147,12 +321,12 @@ def pytest_runtest_makereport(item):
 
 
 def save_screenshot(name):
-    web_driver.save_screenshot(name)
+    browser_pool.current.save_screenshot(name)
 
 
 def save_traceback(name):
     traceback_file = open(name, 'w')
-    traceback_file.writelines(web_driver.find_element_by_xpath('//div[@id="err-bt-text"]').text)
+    traceback_file.writelines(browser_pool.current.find_element_by_xpath('//div[@id="err-bt-text"]').text)
     traceback_file.close()
 
 
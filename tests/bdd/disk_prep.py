@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+from function import poll_On_Job, post
+from job_waiter import CONNECTION_ERRORS, wait_jobs_on_websocket
+
+
+def job_duration(job):
+    started = (job.get('time_started') or {}).get('$date')
+    finished = (job.get('time_finished') or {}).get('$date')
+    if started is None or finished is None:
+        return None
+    return round((finished - started) / 1000, 3)
+
+
+def wait_on_jobs(hostname, auth, job_ids, max_timeout):
+    try:
+        return wait_jobs_on_websocket(hostname, auth, job_ids, max_timeout)
+    except CONNECTION_ERRORS:
+        # the jobs keep running together while they are polled one by one
+        return {job_id: poll_On_Job(hostname, auth, job_id, max_timeout) for job_id in job_ids}
+
+
+def wipe_unused_disks(hostname, auth, mode='QUICK', concurrency=8, max_timeout=300):
+    """
+    Wipe the disks that are not in an imported pool, N/A or exported ones,
+    with at most concurrency disk.wipe jobs running at once. Return
+    {disk: {'state', 'seconds', 'error'}}.
+    """
+    results = post(hostname, '/disk/get_unused/', auth)
+    assert results.status_code == 200, results.text
+    disks = [disk['name'] for disk in results.json()]
+    report = {}
+    for index in range(0, len(disks), concurrency):
+        jobs = {}
+        for disk in disks[index:index + concurrency]:
+            results = post(hostname, '/disk/wipe/', auth, {'dev': disk, 'mode': mode})
+            if results.status_code == 200:
+                jobs[results.json()] = disk
+            else:
+                report[disk] = {'state': 'FAILED', 'seconds': None, 'error': results.text}
+        for job_id, job in wait_on_jobs(hostname, auth, list(jobs), max_timeout).items():
+            report[jobs[job_id]] = {
+                'state': job['state'],
+                'seconds': job_duration(job['results']),
+                'error': job['results'].get('error')
+            }
+    return report
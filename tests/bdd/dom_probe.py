@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+import os
+import time
+from dom_wait import ELEMENT_STATE_JS
+from selector_compiler import css_for
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    WebDriverException
+)
+
+# implicit wait set on the browser in conftest.py
+IMPLICIT_WAIT = 2
+
+FIND_SCRIPT = """
+if (arguments[1]) {
+    return document.querySelector(arguments[1]);
+}
+return document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+"""
+
+PROBE_SCRIPT = ELEMENT_STATE_JS + """
+var selectors = arguments[0], results = {};
+Object.keys(selectors).forEach(function (name) {
+    var element = document.evaluate(selectors[name], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    results[name] = {
+        present: element !== null,
+        visible: element !== null && isVisible(element),
+        enabled: element !== null && isEnabled(element),
+        text: element !== null ? (element.innerText || element.textContent || '').trim() : null
+    };
+});
+return results;
+"""
+
+# presence probes done during the run, implicit_wait_seconds is the time
+# measured on probes going through the implicit wait and skipped_waits the
+# absent elements the in-browser probes found without it.
+probe_stats = {
+    'probes': 0,
+    'absent': 0,
+    'implicit_wait_seconds': 0.0,
+    'skipped_waits': 0
+}
+
+
+def _find_with_implicit_wait(driver, xpath):
+    start = time.time()
+    try:
+        return driver.find_element_by_xpath(xpath)
+    except NoSuchElementException:
+        probe_stats['implicit_wait_seconds'] += time.time() - start
+        return None
+
+
+def find_if_present(driver, xpath):
+    """
+    Return the first element matching xpath or None right away, absent
+    elements do not wait on the implicit wait.
+    PRESENCE_PROBE=implicit use find_element_by_xpath like before.
+    """
+    probe_stats['probes'] += 1
+    if os.environ.get('PRESENCE_PROBE') == 'implicit':
+        element = _find_with_implicit_wait(driver, xpath)
+    else:
+        try:
+            element = driver.execute_script(FIND_SCRIPT, xpath, css_for(xpath))
+            if element is None:
+                probe_stats['skipped_waits'] += 1
+        except WebDriverException:
+            element = _find_with_implicit_wait(driver, xpath)
+    if element is None:
+        probe_stats['absent'] += 1
+    return element
+
+
+def is_present(driver, xpath):
+    return find_if_present(driver, xpath) is not None
+
+
+def probe_summary():
+    return (
+        f"presence probes: {probe_stats['probes']}, absent: {probe_stats['absent']}, "
+        f"time lost to implicit waits: {probe_stats['implicit_wait_seconds']:.1f}s, "
+        f"implicit waits skipped: {probe_stats['skipped_waits']} "
+        f"(estimated up to {probe_stats['skipped_waits'] * IMPLICIT_WAIT}s)"
+    )
+
+
+def probe(driver, selectors):
+    """
+    Return {name: {present, visible, enabled, text}} for every
+    {name: xpath} in selectors with a single WebDriver command.
+    """
+    try:
+        return driver.execute_script(PROBE_SCRIPT, selectors)
+    except WebDriverException:
+        # the page is unloading, report everything as absent
+        absent = {'present': False, 'visible': False, 'enabled': False, 'text': None}
+        return {name: dict(absent) for name in selectors}
+
+
+def wait_for_probe(driver, wait, selectors, condition):
+    """
+    Probe the selectors until condition(results) is True or wait seconds
+    passed, return the last results when satisfied and None otherwise.
+    """
+    timeout = time.time() + wait
+    while True:
+        results = probe(driver, selectors)
+        if condition(results):
+            return results
+        if time.time() > timeout:
+            return None
+        # this just to slow down the loop
+        time.sleep(0.1)
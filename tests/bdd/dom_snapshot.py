@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import os
+import re
+
+# The page without its scripts, so a snapshot opened again stays as it was.
+# The values typed in the inputs are kept as attributes, the elements not
+# rendered are marked with data-snapshot-hidden and the URL is kept in a
+# snapshot-url meta for the replay driver.
+SNAPSHOT_SCRIPT = """
+var copy = document.documentElement.cloneNode(true);
+var live = document.documentElement.querySelectorAll('*'), copies = copy.querySelectorAll('*');
+for (var index = 0; index < live.length; index++) {
+    var element = live[index], copied = copies[index];
+    if (element.getClientRects().length === 0 || window.getComputedStyle(element).visibility === 'hidden') {
+        copied.setAttribute('data-snapshot-hidden', '');
+    }
+    if (element.matches('input, textarea, select')) {
+        copied.setAttribute('value', element.value);
+    }
+    if (element.checked) {
+        copied.setAttribute('checked', '');
+    }
+}
+Array.prototype.forEach.call(copy.querySelectorAll('script'), function (script) {
+    script.remove();
+});
+var url = document.createElement('meta');
+url.setAttribute('name', 'snapshot-url');
+url.setAttribute('content', location.href);
+(copy.querySelector('head') || copy).appendChild(url);
+return '<!DOCTYPE html>\\n' + copy.outerHTML;
+"""
+
+# the parsed scripts of DOMParser do not run
+LOAD_SCRIPT = """
+var page = new DOMParser().parseFromString(arguments[0], 'text/html');
+document.replaceChild(document.adoptNode(page.documentElement), document.documentElement);
+"""
+
+
+def snapshot_name(name):
+    return re.sub(r'[^\w.-]+', '_', name).strip('_')
+
+
+def save_snapshot(driver, name, directory='results/dom_snapshots'):
+    """
+    Save the DOM of the current page as directory/<name>.html and return
+    the path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = f'{directory}/{snapshot_name(name)}.html'
+    with open(path, 'w', encoding='utf-8') as snapshot:
+        snapshot.write(driver.execute_script(SNAPSHOT_SCRIPT))
+    return path
+
+
+def save_step_snapshot(driver, test, number, step, directory='results/dom_snapshots'):
+    """
+    Save the DOM after the step number of test as
+    directory/<test>/<number>-<step>.html.
+    """
+    return save_snapshot(driver, f'{number:03}-{step}', f'{directory}/{snapshot_name(test)}')
+
+
+def step_snapshots(test, directory='results/dom_snapshots'):
+    """
+    Return {step number: path} of the snapshots saved for test.
+    """
+    snapshots = {}
+    for path in snapshot_files(f'{directory}/{snapshot_name(test)}'):
+        number = re.match(r'(\d+)-', os.path.basename(path))
+        if number:
+            snapshots[int(number.group(1))] = path
+    return snapshots
+
+
+def snapshot_files(directory='results/dom_snapshots'):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(root, name)
+        for root, _, files in os.walk(directory)
+        for name in files if name.endswith('.html')
+    )
+
+
+def load_snapshot(driver, path):
+    """
+    Replace the page of the browser with the snapshot at path.
+    """
+    with open(path, encoding='utf-8') as snapshot:
+        html = snapshot.read()
+    driver.get('about:blank')
+    driver.execute_script(LOAD_SCRIPT, html)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+import time
+from selector_compiler import css_for
+from selenium.common.exceptions import (
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException
+)
+
+# same visibility and enabled rules as Selenium is_displayed/is_enabled
+ELEMENT_STATE_JS = """
+function hasSize(element) {
+    var rect = element.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+
+function isVisible(element) {
+    if (!element.isConnected || element.getClientRects().length === 0) {
+        return false;
+    }
+    for (var node = element; node && node.nodeType === Node.ELEMENT_NODE; node = node.parentElement) {
+        var style = window.getComputedStyle(node);
+        if (style.display === 'none' || style.opacity === '0') {
+            return false;
+        }
+    }
+    if (window.getComputedStyle(element).visibility === 'hidden') {
+        return false;
+    }
+    return hasSize(element) || Array.prototype.some.call(element.querySelectorAll('*'), hasSize);
+}
+
+function isEnabled(element) {
+    return !element.disabled && !element.closest('fieldset[disabled]');
+}
+"""
+
+# Resolve inside the browser as soon as the XPath matches the condition
+# instead of polling it over the WebDriver protocol.
+WAIT_SCRIPT = ELEMENT_STATE_JS + """
+var xpath = arguments[0], condition = arguments[1], attribute = arguments[2],
+    value = arguments[3], timeout = arguments[4], css = arguments[5], done = arguments[arguments.length - 1];
+
+function find() {
+    // the CSS selector compiled from an attribute only XPath is cheaper to
+    // check on every mutation
+    if (css) {
+        return document.querySelector(css);
+    }
+    return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+
+function check() {
+    var element = find();
+    switch (condition) {
+        case 'gone':
+            return element === null;
+        case 'presence':
+            return element !== null;
+        case 'attribute':
+            return element !== null && (element.getAttribute(attribute) || '').indexOf(value) !== -1;
+        case 'clickable':
+        case 'inputable':
+            return element !== null && isVisible(element) && isEnabled(element);
+        default:
+            return element !== null && isVisible(element);
+    }
+}
+
+if (check()) {
+    done(true);
+    return;
+}
+
+var finished = false, scheduled = false, observer, interval, timer;
+
+function finish(result) {
+    if (!finished) {
+        finished = true;
+        observer.disconnect();
+        clearInterval(interval);
+        clearTimeout(timer);
+        done(result);
+    }
+}
+
+function scheduleCheck() {
+    // check at most once per frame while Angular is rendering
+    if (!scheduled && !finished) {
+        scheduled = true;
+        setTimeout(function () {
+            scheduled = false;
+            if (check()) {
+                finish(true);
+            }
+        }, 16);
+    }
+}
+
+observer = new MutationObserver(scheduleCheck);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+// visibility can also change with CSS transitions that do not touch the DOM
+interval = setInterval(scheduleCheck, 250);
+timer = setTimeout(function () { finish(check()); }, timeout);
+"""
+
+
+def _transient(error):
+    """
+    Return True for the errors of a page that changed during the script,
+    an invalid XPath or a broken script needs to fail right away.
+    """
+    if isinstance(error, (NoSuchElementException, StaleElementReferenceException, TimeoutException)):
+        return True
+    # the page was unloaded by a navigation or a reload during the wait
+    return isinstance(error, JavascriptException) and 'unloaded' in str(error.msg).lower()
+
+
+def _set_script_timeout(driver, wait):
+    # the script timeout only needs to be raised, skip the round-trip otherwise.
+    if getattr(driver, '_dom_wait_script_timeout', 0) < wait:
+        driver.set_script_timeout(wait)
+        driver._dom_wait_script_timeout = wait
+
+
+def wait_for_xpath(driver, wait, xpath, condition=None, attribute=None, value=None):
+    """
+    Wait up to wait seconds for xpath to meet condition, the conditions are
+    visible (default), clickable, inputable, presence, gone and attribute.
+    An attribute only xpath is checked with its CSS selector instead,
+    SELECTOR_ENGINE=xpath always evaluate the XPath.
+    """
+    deadline = time.time() + wait
+    css = css_for(xpath)
+    while True:
+        remaining = max(deadline - time.time(), 0)
+        try:
+            _set_script_timeout(driver, int(remaining) + 10)
+            return driver.execute_async_script(WAIT_SCRIPT, xpath, condition, attribute, value, int(remaining * 1000), css) is True
+        except WebDriverException as error:
+            # the page was unloaded during the wait, try again on the new page.
+            if not _transient(error):
+                raise
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.1)
+
+
+# Resolve once Angular has no pending macrotasks, no websocket call from
+# ws.service.ts is waiting on its result and no finite animation is running.
+IDLE_SCRIPT = """
+var timeout = arguments[0], quiet = arguments[1], done = arguments[arguments.length - 1];
+
+if (!window.__uitestPendingCalls) {
+    window.__uitestPendingCalls = new Set();
+    var send = WebSocket.prototype.send;
+    WebSocket.prototype.send = function (data) {
+        if (!this.__uitestTracked) {
+            this.__uitestTracked = true;
+            this.addEventListener('message', function (event) {
+                try {
+                    var message = JSON.parse(event.data);
+                    if (message.msg === 'result') {
+                        window.__uitestPendingCalls.delete(message.id);
+                    }
+                } catch (error) {}
+            });
+            // calls in flight are dropped with the connection, e.g. on failover
+            this.addEventListener('close', function () {
+                window.__uitestPendingCalls.clear();
+            });
+        }
+        try {
+            var message = JSON.parse(data);
+            if (message.msg === 'method') {
+                window.__uitestPendingCalls.add(message.id);
+            }
+        } catch (error) {}
+        return send.apply(this, arguments);
+    };
+}
+
+function angularStable() {
+    if (typeof window.getAllAngularTestabilities !== 'function') {
+        return true;
+    }
+    return window.getAllAngularTestabilities().every(function (testability) {
+        return testability.isStable();
+    });
+}
+
+function animating() {
+    if (typeof document.getAnimations !== 'function') {
+        return false;
+    }
+    // spinners and progress bars loop forever and never settle
+    return document.getAnimations().some(function (animation) {
+        return animation.playState === 'running' && animation.effect
+            && animation.effect.getComputedTiming().iterations !== Infinity;
+    });
+}
+
+var start = Date.now(), idleSince = null;
+var interval = setInterval(function () {
+    var now = Date.now();
+    if (angularStable() && window.__uitestPendingCalls.size === 0 && !animating()) {
+        idleSince = idleSince === null ? now : idleSince;
+        if (now - idleSince >= quiet) {
+            clearInterval(interval);
+            done(true);
+            return;
+        }
+    } else {
+        idleSince = null;
+    }
+    if (now - start >= timeout) {
+        clearInterval(interval);
+        done(false);
+    }
+}, 25);
+"""
+
+
+def wait_for_app_idle(driver, wait=10, quiet=0.1):
+    """
+    Wait up to wait seconds for the web UI to settle, the app needs to stay
+    idle for quiet seconds to cover the gap between chained calls.
+    """
+    deadline = time.time() + wait
+    while True:
+        remaining = max(deadline - time.time(), 0)
+        try:
+            _set_script_timeout(driver, int(remaining) + 10)
+            return driver.execute_async_script(IDLE_SCRIPT, int(remaining * 1000), int(quiet * 1000)) is True
+        except WebDriverException as error:
+            if not _transient(error):
+                raise
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.1)
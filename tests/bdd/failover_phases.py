@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import requests
+import time
+from api_client import RestClient
+
+# the order the phases of a failover go through
+phases = ['click', 'ui_disconnected', 'login_page', 'ha_enabled', 'api_ready', 'services_ready']
+
+
+class FailoverTracker:
+    """
+    Timestamp the phases of the failover started from the web UI, each run
+    is appended to results/failover/phases.jsonl with the build it ran on.
+    """
+
+    def __init__(self, results_file='results/failover/phases.jsonl'):
+        self.results_file = results_file
+        self.run = None
+        self.clients = {}
+
+    def client(self, host):
+        # no retries and a short timeout, a poll that blocks while the node
+        # comes back would record the phase late
+        if host not in self.clients:
+            self.clients[host] = RestClient(host, timeout=(2, 5), retries=0)
+        return self.clients[host]
+
+    def start(self):
+        self.save()
+        # PYTEST_CURRENT_TEST is "<file>::<test> (call)"
+        test = os.environ.get('PYTEST_CURRENT_TEST', '').split(' ')[0]
+        self.run = {'test': test, 'build': None, 'started': time.time(), 'phases': {}}
+        self.mark('click')
+
+    def mark(self, phase):
+        """
+        Record the seconds since the click the first time phase is reached.
+        """
+        if self.run is not None and phase not in self.run['phases']:
+            self.run['phases'][phase] = round(time.time() - self.run['started'], 3)
+
+    def wait_for_api(self, host, auth, timeout=180):
+        """
+        Wait until the controller answering on host is the active one and
+        answers authenticated API calls, then record api_ready.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                results = self.client(host).get('failover/status/', auth)
+                if results.status_code == 200 and results.json() == 'MASTER':
+                    self.mark('api_ready')
+                    if self.run is not None:
+                        self.run['build'] = self.client(host).get('system/version/', auth).json()
+                    return True
+            except (requests.RequestException, ValueError):
+                pass
+            time.sleep(1)
+        return False
+
+    def wait_for_services(self, host, auth, services, timeout=180):
+        """
+        Wait until the services are RUNNING, then record services_ready and
+        save the run.
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                results = self.client(host).get('service/', auth)
+                if results.status_code == 200:
+                    states = {service['service']: service['state'] for service in results.json()}
+                    if all(states.get(service) == 'RUNNING' for service in services):
+                        self.mark('services_ready')
+                        self.save()
+                        return True
+            except (requests.RequestException, ValueError):
+                pass
+            time.sleep(1)
+        return False
+
+    def save(self):
+        if self.run is None:
+            return
+        os.makedirs(os.path.dirname(self.results_file), exist_ok=True)
+        with open(self.results_file, 'a') as outfile:
+            outfile.write(json.dumps(self.run) + '\n')
+        self.run = None
+
+
+failover_tracker = FailoverTracker()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import shlex
+import signal
+import threading
+import time
+from ssh_pool import ssh_options, ssh_pool
+from subprocess import Popen, PIPE, DEVNULL
+
+# The loops only print "<op> begin" and "<op> ok|fail", the lines are
+# timestamped when they come in so the same loop runs on Linux and FreeBSD
+# clients. The writes are fsync'ed to reach the NAS on every operation.
+DIRECTORY_PROBE = """
+file={file}
+while true; do
+    echo write begin
+    if echo probe | timeout -s KILL {op_timeout} dd of="$file" conv=fsync 2>/dev/null; then echo write ok; else echo write fail; fi
+    echo read begin
+    if timeout -s KILL {op_timeout} cat "$file" > /dev/null; then echo read ok; else echo read fail; fi
+    sleep {interval}
+done
+"""
+
+SMB_PROBE = """
+local_file=$(mktemp)
+trap 'rm -f "$local_file"' EXIT
+echo probe > "$local_file"
+while true; do
+    echo put begin
+    if timeout -s KILL {op_timeout} smbclient {share} -U {credential} -c "put $local_file {name}" > /dev/null 2>&1; then echo put ok; else echo put fail; fi
+    echo get begin
+    if timeout -s KILL {op_timeout} smbclient {share} -U {credential} -c "get {name} /dev/null" > /dev/null 2>&1; then echo get ok; else echo get fail; fi
+    sleep {interval}
+done
+"""
+
+PROBE_FILE = '.uitest_failover_probe'
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * percent / 100), len(values) - 1)]
+
+
+class IOProbe:
+    """
+    Run a probe loop in the background until stop(), over ssh when host is
+    given or on the test runner otherwise, and keep each operation result.
+    """
+
+    def __init__(self, protocol, target, script, username=None, password=None, host=None, cleanup=None):
+        self.protocol = protocol
+        self.target = target
+        self.script = script
+        self.username = username
+        self.password = password
+        self.host = host
+        self.cleanup = cleanup
+        self.ops = []
+        self.pending = {}
+        self.process = None
+        self.reader = None
+
+    def _read(self):
+        for line in self.process.stdout:
+            now = time.time()
+            fields = line.split()
+            if len(fields) != 2:
+                continue
+            op, status = fields
+            if status == 'begin':
+                self.pending[op] = now
+            elif op in self.pending:
+                begin = self.pending.pop(op)
+                self.ops.append({
+                    'time': round(begin, 3),
+                    'op': op,
+                    'ok': status == 'ok',
+                    'latency_ms': round((now - begin) * 1000)
+                })
+
+    def start(self):
+        if self.host is None:
+            cmd = ['bash', '-c', self.script]
+        else:
+            # a session of its own, Confirm_Failover resets the pool masters
+            # right when the probe needs to keep running, sh -c because the
+            # login shell of the NAS may be csh
+            cmd = [] if self.password is None else ['sshpass', '-p', self.password]
+            cmd += ['ssh', *ssh_options, '-o', 'ControlPath=none', f'{self.username}@{self.host}',
+                    f'sh -c {shlex.quote(self.script)}']
+        self.process = Popen(cmd, stdin=DEVNULL, stdout=PIPE, stderr=DEVNULL, universal_newlines=True,
+                             start_new_session=True)
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+        return self
+
+    def stop(self):
+        if self.process is not None:
+            stopped = time.time()
+            os.killpg(self.process.pid, signal.SIGTERM)
+            self.process.wait()
+            self.reader.join(timeout=5)
+            self.process = None
+            # an operation still hanging, like on a hard NFS mount, failed
+            for op, begin in self.pending.items():
+                self.ops.append({'time': round(begin, 3), 'op': op, 'ok': False,
+                                 'latency_ms': round((stopped - begin) * 1000)})
+            self.pending = {}
+        if self.cleanup is not None:
+            self.cleanup()
+        return self.report()
+
+    def report(self):
+        """
+        Return the stall timeline, the longest stall is the longest time
+        between two successful operations.
+        """
+        self.ops.sort(key=lambda op: op['time'])
+        failed = [op for op in self.ops if not op['ok']]
+        succeeded = [op for op in self.ops if op['ok']]
+        stall = {'start': None, 'end': None, 'seconds': 0.0}
+        for before, after in zip(succeeded, succeeded[1:]):
+            gap = after['time'] - before['time']
+            if gap > stall['seconds']:
+                stall = {'start': before['time'], 'end': after['time'], 'seconds': round(gap, 3)}
+        latencies = [op['latency_ms'] for op in succeeded]
+        return {
+            'protocol': self.protocol,
+            'target': self.target,
+            'ops': len(self.ops),
+            'failed_ops': len(failed),
+            'first_failed': failed[0]['time'] if failed else None,
+            'last_failed': failed[-1]['time'] if failed else None,
+            'longest_stall': stall,
+            'p50_ms': percentile(latencies, 50),
+            'p99_ms': percentile(latencies, 99),
+            'timeline': self.ops
+        }
+
+
+def directory_probe(protocol, directory, username, password, host, interval=0.2, op_timeout=5):
+    """
+    Probe a directory on the client host, like an NFS mount or the mount
+    point of an iSCSI device.
+    """
+    probe_file = f'{directory}/{PROBE_FILE}'
+    script = DIRECTORY_PROBE.format(file=shlex.quote(probe_file), interval=interval, op_timeout=op_timeout)
+
+    def cleanup():
+        ssh_pool.run(f'rm -f {shlex.quote(probe_file)}', username, password, host, 30)
+
+    return IOProbe(protocol, directory, script, username, password, host, cleanup)
+
+
+def smb_probe(share, smb_user, smb_password, interval=0.2, op_timeout=5):
+    """
+    Probe an SMB share like //<nas_hostname>/<share_name> with smbclient
+    from the test runner.
+    """
+    script = SMB_PROBE.format(share=shlex.quote(share), credential=shlex.quote(f'{smb_user}%{smb_password}'),
+                              name=PROBE_FILE, interval=interval, op_timeout=op_timeout)
+
+    def cleanup():
+        Popen(['smbclient', share, '-U', f'{smb_user}%{smb_password}', '-c', f'del {PROBE_FILE}'],
+              stdout=DEVNULL, stderr=DEVNULL).wait(timeout=30)
+
+    return IOProbe('SMB', share, script, cleanup=cleanup)
+
+
+def save_failover_report(test_name, reports, directory='results/failover'):
+    """
+    Write the probe reports to results/failover/<test_name>.json and return
+    a one line summary per protocol.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(f'{directory}/{test_name}.json', 'w') as outfile:
+        json.dump(reports, outfile, indent=2)
+    return [
+        f"{report['protocol']}: longest stall {report['longest_stall']['seconds']}s, "
+        f"{report['failed_ops']}/{report['ops']} ops failed, p50 {report['p50_ms']}ms, p99 {report['p99_ms']}ms"
+        for report in reports
+    ]
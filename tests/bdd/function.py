@@ -1,34 +1,48 @@
 #!/usr/bin/env python3
 
-import json
 import os
 import pexpect
 import re
-import requests
 import sys
 import time
+from api_client import api_client
 from collections.abc import Iterable
-from selenium.common.exceptions import (
-    NoSuchElementException,
-    TimeoutException
-)
+from dom_probe import is_present
+from dom_wait import wait_for_app_idle, wait_for_xpath
+from job_waiter import CONNECTION_ERRORS, wait_job_on_websocket
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as ec
-from subprocess import run, PIPE, TimeoutExpired
-
-header = {'Content-Type': 'application/json', 'Vary': 'accept'}
+from ssh_pool import ssh_pool
+from subprocess import run, PIPE
 
 
 def is_element_present(driver, xpath):
-    try:
-        driver.find_element_by_xpath(xpath)
-    except NoSuchElementException:
-        return False
-    return True
+    return is_present(driver, xpath)
+
+
+def settle(driver, seconds):
+    # SETTLE_MODE=idle only wait until the web UI is idle instead of sleeping,
+    # never longer than the sleep, what is left is slept when it is not idle
+    if os.environ.get('SETTLE_MODE') == 'idle':
+        start = time.time()
+        if not wait_for_app_idle(driver, seconds):
+            time.sleep(max(seconds - (time.time() - start), 0))
+    else:
+        time.sleep(seconds)
 
 
 def wait_on_element(driver, wait, xpath, condition=None):
+    if condition == 'inputable':
+        settle(driver, 1)
+    # WAIT_ENGINE=polling use WebDriverWait instead of waiting in the browser
+    if os.environ.get('WAIT_ENGINE') == 'polling':
+        return poll_on_element(driver, wait, xpath, condition)
+    return wait_for_xpath(driver, wait, xpath, condition)
+
+
+def poll_on_element(driver, wait, xpath, condition=None):
     if condition == 'clickable':
         try:
             WebDriverWait(driver, wait).until(ec.element_to_be_clickable((By.XPATH, xpath)))
@@ -36,7 +50,6 @@ def wait_on_element(driver, wait, xpath, condition=None):
         except TimeoutException:
             return False
     elif condition == 'inputable':
-        time.sleep(1)
         try:
             WebDriverWait(driver, wait).until(ec.element_to_be_clickable((By.XPATH, xpath)))
             return True
@@ -57,6 +70,8 @@ def wait_on_element(driver, wait, xpath, condition=None):
 
 
 def wait_on_element_disappear(driver, wait, xpath):
+    if os.environ.get('WAIT_ENGINE') != 'polling':
+        return wait_for_xpath(driver, wait, xpath, 'gone')
     timeout = time.time() + wait
     while time.time() <= timeout:
         if not is_element_present(driver, xpath):
@@ -97,6 +112,8 @@ def attribute_value_exist(driver, xpath, attribute, value):
 
 
 def wait_for_attribute_value(driver, wait, xpath, attribute, value):
+    if os.environ.get('WAIT_ENGINE') != 'polling':
+        return wait_for_xpath(driver, wait, xpath, 'attribute', attribute, value)
     timeout = time.time() + wait
     while time.time() <= timeout:
         if attribute_value_exist(driver, xpath, attribute, value):
@@ -107,30 +124,16 @@ def wait_for_attribute_value(driver, wait, xpath, attribute, value):
         return False
 
 
-def ssh_cmd(command, username, password, host):
-    cmd = [] if password is None else ["sshpass", "-p", password]
-    cmd += [
-        "ssh",
-        "-o",
-        "StrictHostKeyChecking=no",
-        "-o",
-        "UserKnownHostsFile=/dev/null",
-        "-o",
-        "VerifyHostKeyDNS=no",
-        f"{username}@{host}",
-        command
-    ]
-    try:
-        process = run(cmd, stdout=PIPE, stderr=PIPE, universal_newlines=True,
-                      timeout=5)
-        output = process.stdout
-        stderr = process.stderr
-        if process.returncode != 0:
-            return {'result': False, 'output': output, 'stderr': stderr}
-        else:
-            return {'result': True, 'output': output, 'stderr': stderr}
-    except TimeoutExpired:
-        return {'result': False, 'output': 'Timeout', 'stderr': 'Timeout'}
+def ssh_cmd(command, username, password, host, timeout=5):
+    return ssh_pool.run(command, username, password, host, timeout)
+
+
+def ssh_batch(commands, username, password, host, timeout=30):
+    return ssh_pool.run_batch(commands, username, password, host, timeout)
+
+
+def reset_ssh_connections():
+    ssh_pool.reset()
 
 
 def start_ssh_agent():
@@ -194,42 +197,19 @@ def run_cmd(command):
 
 
 def get(url, api_path, auth):
-    get_it = requests.get(
-        f'http://{url}/api/v2.0/{api_path}',
-        headers=header,
-        auth=auth
-    )
-    return get_it
+    return api_client(url).get(api_path, auth)
 
 
 def post(url, api_path, auth, payload=None):
-    post_it = requests.post(
-        f'http://{url}/api/v2.0/{api_path}',
-        headers=header,
-        auth=auth,
-        data=json.dumps(payload) if payload else None
-    )
-    return post_it
+    return api_client(url).post(api_path, auth, payload)
 
 
 def put(url, api_path, auth, payload=None):
-    put_it = requests.put(
-        f'http://{url}/api/v2.0/{api_path}',
-        headers=header,
-        auth=auth,
-        data=json.dumps(payload) if payload else None
-    )
-    return put_it
+    return api_client(url).put(api_path, auth, payload)
 
 
 def delete(url, api_path, auth, payload=None):
-    delete_it = requests.delete(
-        f'http://{url}/api/v2.0/{api_path}',
-        headers=header,
-        auth=auth,
-        data=json.dumps(payload) if payload else None
-    )
-    return delete_it
+    return api_client(url).delete(api_path, auth, payload)
 
 
 def ssh_sudo(cmd, host, user, password):
@@ -299,7 +279,17 @@ def word_xor(data, key):
     return result
 
 
-def wait_On_Job(hostname, auth, job_id, max_timeout):
+def wait_On_Job(hostname, auth, job_id, max_timeout, progress=None, url=None):
+    # url replace the middleware websocket like for a local stand-in server
+    start = time.time()
+    try:
+        return wait_job_on_websocket(hostname, auth, job_id, max_timeout, progress, url)
+    except CONNECTION_ERRORS:
+        # the websocket is not available, poll the REST API for the time left
+        return poll_On_Job(hostname, auth, job_id, max(max_timeout - (time.time() - start), 0))
+
+
+def poll_On_Job(hostname, auth, job_id, max_timeout):
     global job_results
     timeout = 0
     while True:
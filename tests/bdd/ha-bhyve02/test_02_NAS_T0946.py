@@ -5,6 +5,7 @@ import pytest
 import reusableSeleniumCode as rsc
 import time
 import xpaths
+from disk_prep import wipe_unused_disks
 from function import (
     wait_on_element,
     wait_on_element_disappear,
@@ -211,9 +212,7 @@ def after_settings_are_applied_you_should_see_settings_applied(driver):
 @then('navigate to Network then under Interfaces click enp0s6f0')
 def navigate_to_network_then_under_interfacesclick_enp0s6f0(driver):
     """navigate to Network then under Interfaces click enp0s6f0."""
-    assert wait_on_element(driver, 7, xpaths.side_Menu.network, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.network).click()
-    assert wait_on_element(driver, 7, xpaths.network.title)
+    rsc.Go_To(driver, 'network')
     assert wait_on_element(driver, 7, xpaths.network.interface_Card_Title)
     assert wait_on_element(driver, 7, xpaths.network.interface_Row('enp0s6f0'))
     assert wait_on_element(driver, 7, xpaths.network.interface_Edit_Button('enp-0-s-6-f-0'))
@@ -324,7 +323,11 @@ def the_list_of_disks_should_appear_in_ascending_order_starting_with_sda(driver)
 @then('wipe all disk without a pool')
 def wipe_all_disk_without_a_pool(driver):
     """wipe all disk without a pool."""
-    rsc.Wiped_Unused_Disk(driver)
+    # the wipe through the UI is covered by NAS-T1101
+    report = wipe_unused_disks(NAS_HOSTNAME, ('root', ADMIN_PASSWORD))
+    for disk, wipe in sorted(report.items()):
+        print(f'{disk}: {wipe["state"]} in {wipe["seconds"]}s')
+    assert all(wipe['state'] == 'SUCCESS' for wipe in report.values()), report
 
 
 # TODO: when Bluefin is replaced by Cobia the steps below need to be refactor.
@@ -19,6 +19,7 @@ from pytest_bdd import (
     parsers
 )
 from pytest_dependency import depends
+pytestmark = [pytest.mark.exclusive]
 
 
 @pytest.mark.dependency(name='System_Dataset', scope='session')
@@ -58,8 +59,7 @@ def you_should_see_the_dashboard_and_the_system_information(driver):
 @then('navigate to Storage')
 def navigate_to_storage(driver):
     """navigate to Storage."""
-    assert wait_on_element(driver, 10, xpaths.side_Menu.storage, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.storage).click()
+    rsc.Go_To(driver, 'storage')
 
 
 # TODO: when Bluefin is replaced by Cobia the steps below need to be refactor.
@@ -20,6 +20,7 @@ from pytest_bdd import (
     parsers
 )
 from pytest_dependency import depends
+pytestmark = [pytest.mark.exclusive]
 
 
 @pytest.mark.dependency(name='Active_Directory', scope='session')
@@ -57,8 +58,7 @@ def on_the_dashboard_click_network_on_the_left_sidebar(driver):
     if wait_on_element(driver, 2, '//button[@ix-auto="button__I AGREE"]', 'clickable'):
         driver.find_element_by_xpath('//button[@ix-auto="button__I AGREE"]').click()
     assert wait_on_element(driver, 10, xpaths.dashboard.system_Info_Card_Title)
-    assert wait_on_element(driver, 5, xpaths.side_Menu.network, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.network).click()
+    rsc.Go_To(driver, 'network')
     assert wait_on_element_disappear(driver, 20, xpaths.popup.please_Wait)
 
 
@@ -246,8 +246,7 @@ def on_the_dashboard_wait_for_the_active_Directory_service(driver):
 def after_click_dataset_on_the_left_sidebar(driver):
     """after click Dataset on the left sidebar."""
     assert wait_on_element(driver, 20, xpaths.dashboard.title)
-    assert wait_on_element(driver, 10, xpaths.side_Menu.datasets, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.datasets).click()
+    rsc.Go_To(driver, 'datasets')
 
 
 @then('on the Dataset page, click on the dozer tree and click Add Dataset')
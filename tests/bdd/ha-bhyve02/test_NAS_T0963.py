@@ -46,8 +46,7 @@ def on_the_dashboard_click_dataset_on_the_left_sidebar(driver):
     """on the Dashboard, click Dataset on the left sidebar."""
     assert wait_on_element(driver, 7, xpaths.dashboard.title)
     assert wait_on_element(driver, 10, xpaths.dashboard.system_Info_Card_Title)
-    assert wait_on_element(driver, 5, xpaths.side_Menu.datasets, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.datasets).click()
+    rsc.Go_To(driver, 'datasets')
 
 
 @then(parsers.parse('on the Dataset page click on the "{dataset_name}" tree'))
@@ -6,6 +6,9 @@ import string
 import reusableSeleniumCode as rsc
 import time
 import xpaths
+from failover_phases import failover_tracker
+from failover_probe import directory_probe, save_failover_report
+from integrity import Manifest, generate_corpus, remove_corpus
 from pytest_dependency import depends
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
@@ -14,6 +17,7 @@ from function import (
     wait_on_element_disappear,
     attribute_value_exist,
     ssh_cmd,
+    ssh_batch,
     get,
     post
 )
@@ -24,6 +28,7 @@ from pytest_bdd import (
     when,
     parsers
 )
+pytestmark = [pytest.mark.exclusive]
 
 
 @pytest.fixture(scope='module')
@@ -31,6 +36,11 @@ def checksum():
     return {}
 
 
+@pytest.fixture(scope='module')
+def failover_probes():
+    return {}
+
+
 @scenario('features/NAS-T1657.feature', 'Verify NFSv3 sharing and service works after failover')
 def test_verify_nfsv3_sharing_and_service_works_after_failover():
     """Verify NFSv3 sharing and service works after failover."""
@@ -54,8 +64,7 @@ def the_browser_is_open_to_nas_hostname_login_with_user_and_password(driver, nas
 def on_the_dashboard_click_on_datasets_on_the_left_side_menu(driver):
     """on the Dashboard, click on Datasets on the left side menu."""
     rsc.Verify_The_Dashboard(driver)
-    assert wait_on_element(driver, 5, xpaths.side_Menu.datasets, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.datasets).click()
+    rsc.Go_To(driver, 'datasets')
 
 
 @then('on the Dataset page, click on the tank tree and click Add Dataset')
@@ -128,8 +137,7 @@ def check_groupwrite_under_access_mode_and_click_save(driver):
 def when_the_changes_are_saved_click_on_shares_on_the_left_side_menu(driver):
     """when the changes are saved, click on Shares on the left side menu."""
     assert wait_on_element(driver, 5, xpaths.dataset.title)
-    assert wait_on_element(driver, 5, xpaths.side_Menu.shares, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.shares).click()
+    rsc.Go_To(driver, 'shares')
 
 
 @then('on the Sharing page, click the UNIX (NFS) Shares Add button')
@@ -250,29 +258,16 @@ def add_some_files_to_the_local_mount_point_verify_that_they_are_on_the_nas_shar
     """add some files to the local mount point verify that they are on the NAS share <mount_point>."""
     global mount_Point
     mount_Point = mount_point
-    cmd = f'touch {nfs_Local_Mountpoint}/testfile1.text'
-    results1 = ssh_cmd(cmd, linux_User, linux_Password, linux_Host)
-    assert results1['result'], f'{results1["output"]} \n {results1["stderr"]}'
-
-    cmd = f'echo "{text1}" > {nfs_Local_Mountpoint}/testfile1.text'
-    results2 = ssh_cmd(cmd, linux_User, linux_Password, linux_Host)
-    assert results2['result'], f'{results2["output"]} \n {results2["stderr"]}'
-
-    cmd = f'touch {nfs_Local_Mountpoint}/testfile2.text'
-    results3 = ssh_cmd(cmd, linux_User, linux_Password, linux_Host)
-    assert results3['result'], f'{results3["output"]} \n {results3["stderr"]}'
-
-    cmd = f'echo "{text2}" > {nfs_Local_Mountpoint}/testfile2.text'
-    results4 = ssh_cmd(cmd, linux_User, linux_Password, linux_Host)
-    assert results4['result'], f'{results4["output"]} \n {results4["stderr"]}'
-
-    cmd = f'touch {nfs_Local_Mountpoint}/testfile3.text'
-    results5 = ssh_cmd(cmd, linux_User, linux_Password, linux_Host)
-    assert results5['result'], f'{results5["output"]} \n {results5["stderr"]}'
-
-    cmd = f'echo "{text3}" > {nfs_Local_Mountpoint}/testfile3.text'
-    results6 = ssh_cmd(cmd, linux_User, linux_Password, linux_Host)
-    assert results6['result'], f'{results6["output"]} \n {results6["stderr"]}'
+    commands = [
+        f'touch {nfs_Local_Mountpoint}/testfile1.text',
+        f'echo "{text1}" > {nfs_Local_Mountpoint}/testfile1.text',
+        f'touch {nfs_Local_Mountpoint}/testfile2.text',
+        f'echo "{text2}" > {nfs_Local_Mountpoint}/testfile2.text',
+        f'touch {nfs_Local_Mountpoint}/testfile3.text',
+        f'echo "{text3}" > {nfs_Local_Mountpoint}/testfile3.text'
+    ]
+    for results in ssh_batch(commands, linux_User, linux_Password, linux_Host):
+        assert results['result'], f'{results["output"]} \n {results["stderr"]}'
 
     results = post(nas_Hostname, '/filesystem/stat/', (admin_User, admin_Password), f'{mount_point}/testfile1.text')
     assert results.status_code == 200, results.text
@@ -281,32 +276,29 @@ def add_some_files_to_the_local_mount_point_verify_that_they_are_on_the_nas_shar
     results = post(nas_Hostname, '/filesystem/stat/', (admin_User, admin_Password), f'{mount_point}/testfile3.text')
     assert results.status_code == 200, results.text
 
+    # a larger corpus to fail over with more than the three text files
+    global corpus_Files
+    corpus_Files = generate_corpus(f'{nfs_Local_Mountpoint}/integrity_corpus', linux_User, linux_Password, linux_Host)
+
 
 @then('get the checksum for those files to compare it after the failover')
 def get_the_checksum_for_those_files_to_compare_it_after_the_failover(checksum):
     """get the checksum for those files to compare it after the failover."""
-    cmd = f'sha256sum {mount_Point}/testfile1.text'
-    results1 = ssh_cmd(cmd, admin_User, admin_Password, nas_Hostname)
-    assert results1['result'], f'{results1["output"]} \n {results1["stderr"]}'
-    checksum['testfile1.text'] = results1["output"].partition(' ')[0]
-
-    cmd = f'sha256sum {mount_Point}/testfile2.text'
-    results2 = ssh_cmd(cmd, admin_User, admin_Password, nas_Hostname)
-    assert results2['result'], f'{results2["output"]} \n {results2["stderr"]}'
-    checksum['testfile2.text'] = results2["output"].partition(' ')[0]
-
-    cmd = f'sha256sum {mount_Point}/testfile3.text'
-    results3 = ssh_cmd(cmd, admin_User, admin_Password, nas_Hostname)
-    assert results3['result'], f'{results3["output"]} \n {results3["stderr"]}'
-    checksum['testfile3.text'] = results3["output"].partition(' ')[0]
+    manifest = Manifest(mount_Point, admin_User, admin_Password, nas_Hostname)
+    manifest.record(['testfile1.text', 'testfile2.text', 'testfile3.text'] + [f'integrity_corpus/{name}' for name in corpus_Files])
+    manifest.save('NAS-T1657')
+    checksum['manifest'] = manifest
 
 
 @then('go to the Dashboard and click Initiate Failover on the standby controller')
-def go_to_the_dashboard_and_click_initiate_failover_on_the_standby_controller(driver):
+def go_to_the_dashboard_and_click_initiate_failover_on_the_standby_controller(driver, failover_probes):
     """go to the Dashboard and click Initiate Failover on the standby controller."""
     driver.find_element_by_xpath(xpaths.side_Menu.dashboard).click()
     assert wait_on_element(driver, 10, xpaths.dashboard.title)
 
+    # keep I/O going on the share during the failover to measure the downtime
+    failover_probes['nfs'] = directory_probe('NFSv3', nfs_Local_Mountpoint, linux_User, linux_Password, linux_Host).start()
+
     rsc.Trigger_Failover(driver)
 
 
@@ -320,6 +312,7 @@ def on_the_initiate_failover_box_check_the_confirm_checkbox_then_click_failover(
 def wait_for_the_login_to_appear_and_ha_to_be_enabled_login_with_user_and_password(driver, user, password):
     """wait for the login to appear and HA to be enabled, login with <user> and <password>."""
     rsc.HA_Login_Status_Enable(driver)
+    assert failover_tracker.wait_for_api(nas_Hostname, (admin_User, admin_Password))
 
     rsc.Login(driver, user, password)
 
@@ -335,8 +328,9 @@ def once_on_the_dashboard_click_on_system_settings_and_click_services(driver):
 
 
 @then('verify the NFS service is RUNNING in the UI and with the API')
-def verify_the_nfs_service_is_running_in_the_ui_and_with_the_api(driver):
+def verify_the_nfs_service_is_running_in_the_ui_and_with_the_api(driver, failover_probes):
     """verify the NFS service is RUNNING in the UI and with the API."""
+    assert failover_tracker.wait_for_services(nas_Hostname, (admin_User, admin_Password), ['nfs'])
     assert wait_on_element(driver, 7, xpaths.services.title)
     assert wait_on_element(driver, 5, xpaths.services.nfs_Service_Toggle, 'clickable')
     assert attribute_value_exist(driver, xpaths.services.nfs_Service_Toggle, 'class', 'mdc-switch--checked')
@@ -344,24 +338,17 @@ def verify_the_nfs_service_is_running_in_the_ui_and_with_the_api(driver):
     results = get(nas_Hostname, "/service?service=nfs", (admin_User, admin_Password))
     assert results.json()[0]["state"] == "RUNNING", results.text
 
+    if 'nfs' in failover_probes:
+        report = failover_probes.pop('nfs').stop()
+        print('\n'.join(save_failover_report('NAS-T1657', [report])))
+
 
 @then('verify all the files checksum taken before the failover to ensure that the data is not corrupt')
 def verify_all_the_files_checksum_taken_before_the_failover_to_ensure_that_the_data_is_not_corrupt(checksum):
     """verify all the files checksum taken before the failover to ensure that the data is not corrupt."""
-    cmd = f'sha256sum {mount_Point}/testfile1.text'
-    results1 = ssh_cmd(cmd, admin_User, admin_Password, nas_Hostname)
-    assert results1['result'], f'{results1["output"]} \n {results1["stderr"]}'
-    assert checksum['testfile1.text'] in results1["output"], f'{results1["output"]} \n {results1["stderr"]}'
-
-    cmd = f'sha256sum {mount_Point}/testfile2.text'
-    results2 = ssh_cmd(cmd, admin_User, admin_Password, nas_Hostname)
-    assert results2['result'], f'{results2["output"]} \n {results2["stderr"]}'
-    assert checksum['testfile2.text'] in results2["output"], f'{results2["output"]} \n {results2["stderr"]}'
-
-    cmd = f'sha256sum {mount_Point}/testfile3.text'
-    results3 = ssh_cmd(cmd, admin_User, admin_Password, nas_Hostname)
-    assert results3['result'], f'{results3["output"]} \n {results3["stderr"]}'
-    assert checksum['testfile3.text'] in results3["output"], f'{results3["output"]} \n {results3["stderr"]}'
+    report = checksum['manifest'].verify()
+    remove_corpus(f'{nfs_Local_Mountpoint}/integrity_corpus', linux_User, linux_Password, linux_Host)
+    assert report['result'], str(report)
 
 
 text4 = 'New file to verify NFSv3 is working after failover'
@@ -370,13 +357,12 @@ text4 = 'New file to verify NFSv3 is working after failover'
 @then(parsers.parse('create a new file in the local mount and verify that is is on the NAS share {mount_point}'))
 def create_a_new_file_in_the_local_mount_and_verify_that_is_is_on_the_nas_share_mount_point(mount_point):
     """create a new file in the local mount and verify that is is on the NAS share <mount_point>."""
-    cmd = f'touch {nfs_Local_Mountpoint}/testfile4.text'
-    results1 = ssh_cmd(cmd, linux_User, linux_Password, linux_Host)
-    assert results1['result'], f'{results1["output"]} \n {results1["stderr"]}'
-
-    cmd = f'echo "{text4}" > {nfs_Local_Mountpoint}/testfile4.text'
-    results2 = ssh_cmd(cmd, linux_User, linux_Password, linux_Host)
-    assert results2['result'], f'{results2["output"]} \n {results2["stderr"]}'
+    commands = [
+        f'touch {nfs_Local_Mountpoint}/testfile4.text',
+        f'echo "{text4}" > {nfs_Local_Mountpoint}/testfile4.text'
+    ]
+    for results in ssh_batch(commands, linux_User, linux_Password, linux_Host):
+        assert results['result'], f'{results["output"]} \n {results["stderr"]}'
 
     results = post(nas_Hostname, '/filesystem/stat/', (admin_User, admin_Password), f'{mount_point}/testfile4.text')
     assert results.status_code == 200, results.text
@@ -16,6 +16,7 @@ from pytest_bdd import (
     when,
     parsers
 )
+pytestmark = [pytest.mark.exclusive]
 
 
 @pytest.fixture(scope='module')
@@ -71,7 +72,7 @@ def wait_for_the_alert_to_appear_and_verify_the_volume_and_the_state_is_degraded
     """wait for the alert to appear and verify the volume and the state is degraded."""
     assert wait_on_element(driver, 7, xpaths.toolbar.notification)
 
-    rsc.Verify_Degraded_Alert(driver)
+    rsc.Verify_Degraded_Alert(driver, nas_Hostname, (admin_User, admin_Password))
 
 
 @then('on the Dashboard, click Initiate Failover on the standby controller')
@@ -103,7 +104,7 @@ def on_the_dashboard_verify_the_alert_exists_after_failover_with_the_right_volum
     assert wait_on_element(driver, 180, xpaths.toolbar.ha_Enabled)
     # if there is prefious the License Agrement might show up
     rsc.License_Agrement(driver)
-    rsc.Verify_Degraded_Alert(driver)
+    rsc.Verify_Degraded_Alert(driver, nas_Hostname, (admin_User, admin_Password))
 
 
 @then('fix the degraded pool and verify that the pool is fixed')
@@ -123,7 +124,7 @@ def fix_the_degraded_pool_and_verify_that_the_pool_is_fixed():
 def then_wait_for_the_alert_to_disappear_and_trigger_failover_again(driver, notification):
     """then wait for the alert to disappear and trigger failover again."""
 
-    rsc.Verify_Degraded_Alert_Is_Gone(driver)
+    rsc.Verify_Degraded_Alert_Is_Gone(driver, nas_Hostname, (admin_User, admin_Password))
 
     rsc.Trigger_Failover(driver)
 
@@ -135,4 +136,4 @@ def on_the_dashboard_verify_that_there_is_no_degraded_pool_alert(driver):
     """on the Dashboard, verify that there is no degraded pool alert."""
     assert wait_on_element(driver, 7, xpaths.toolbar.notification)
 
-    rsc.Verify_Degraded_Alert_Is_Gone(driver)
+    rsc.Verify_Degraded_Alert_Is_Gone(driver, nas_Hostname, (admin_User, admin_Password))
@@ -2,10 +2,8 @@
 
 import pytest
 import reusableSeleniumCode as rsc
-import time
 import xpaths
 from function import (
-    ssh_cmd,
     post,
     wait_on_element
 )
@@ -17,6 +15,8 @@ from pytest_bdd import (
     parsers
 )
 from pytest_dependency import depends
+from remote_log import RemoteLog
+pytestmark = [pytest.mark.exclusive]
 
 
 @pytest.fixture(scope='module')
@@ -52,9 +52,9 @@ def on_the_dashboard_verify_the_middleware_logs_exist(driver, logs_data):
                    (admin_User, admin_Password), '/var/log/middlewared.log')
     assert results.status_code == 200, results.text
 
-    cmd = "cat /var/log/middlewared.log"
-    middlewared_log = ssh_cmd(cmd, admin_User, admin_Password, nas_Hostname)
-    assert middlewared_log['result'] is True, str(middlewared_log)
+    logs_data['middlewared'] = RemoteLog('/var/log/middlewared.log', admin_User, admin_Password, nas_Hostname)
+    logs_data['checkpoint'] = logs_data['middlewared'].checkpoint()
+    assert logs_data['middlewared'].nodes, 'Unable to read /var/log/middlewared.log'
 
 
 @then('click Initiate Failover on the standby controller')
@@ -89,6 +89,9 @@ def on_the_dashboard_verify_the_middleware_logs_still_exist(driver, logs_data):
                    (admin_User, admin_Password), '/var/log/middlewared.log')
     assert results.status_code == 200, results.text
 
-    cmd = "cat /var/log/middlewared.log"
-    middlewared_log = ssh_cmd(cmd, admin_User, admin_Password, nas_Hostname)
+    middlewared_log = logs_data['middlewared'].fetch()
     assert middlewared_log['result'] is True, str(middlewared_log)
+    # the other controller answers after the failover and its log has lines
+    assert middlewared_log['node'] not in logs_data['checkpoint'], str(middlewared_log)
+    new_logs = logs_data['middlewared'].delta(logs_data['checkpoint'])
+    assert new_logs[middlewared_log['node']].strip(), f"{middlewared_log['node']} middlewared.log is empty"
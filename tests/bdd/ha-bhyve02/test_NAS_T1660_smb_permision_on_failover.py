@@ -4,6 +4,8 @@ import pytest
 import reusableSeleniumCode as rsc
 import time
 import xpaths
+from failover_phases import failover_tracker
+from failover_probe import smb_probe, save_failover_report
 from function import (
     wait_on_element,
     wait_on_element_disappear,
@@ -20,6 +22,7 @@ from pytest_bdd import (
     parsers
 )
 from pytest_dependency import depends
+pytestmark = [pytest.mark.exclusive]
 
 
 @pytest.fixture(scope='module')
@@ -32,6 +35,11 @@ def share_Dataset_Data():
     return {}
 
 
+@pytest.fixture(scope='module')
+def failover_probes():
+    return {}
+
+
 @scenario('features/NAS-T1660.feature', 'Verify host sharing permissions on failover')
 def test_verify_host_sharing_permissions_on_failover():
     """Verify host sharing permissions on failover."""
@@ -57,8 +65,7 @@ def on_the_dashboard_click_on_datasets_on_the_left_side_menu(driver):
     """on the Dashboard, click on Datasets on the left side menu."""
     rsc.Verify_The_Dashboard(driver)
 
-    assert wait_on_element(driver, 5, xpaths.side_Menu.datasets, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.datasets).click()
+    rsc.Go_To(driver, 'datasets')
 
 
 @then('on the Datasets page, select the dozer dataset and click Add Dataset')
@@ -156,8 +163,7 @@ def when_the_acl_permision_is_save_click_shares_on_the_left_side_menu(driver):
     assert wait_on_element_disappear(driver, 60, xpaths.popup.updating_Acl)
     assert wait_on_element(driver, 5, xpaths.dataset.permission_Title)
 
-    assert wait_on_element(driver, 5, xpaths.side_Menu.shares, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.shares).click()
+    rsc.Go_To(driver, 'shares')
 
 
 @then('on the Sharing page, click the Add button on Windows (SMB) Shares card')
@@ -198,6 +204,8 @@ def click_save_if_restart_smb_service_box_appears_click_restart_service(driver):
 @then(parsers.parse('send a file to the {share_name} share and verify the file exist and get the acl permission of smbtest1'))
 def send_a_file_to_the_smbtest1_share_and_verify_the_file_exist_and_get_the_acl_permission_of_smbtest1(driver, acl_Permission_Data, share_name, share_Dataset_Data):
     """send a file to the smbtest1 share and verify the file exist and get the acl permission of smbtest1."""
+    global writable_Share
+    writable_Share = share_name
     run_cmd('touch testfile.txt')
     results = run_cmd(f'smbclient //{nas_Hostname}/{share_name} -U ericbsd%testing1 -c "put testfile.txt testfile.txt"')
     assert results['result'], results['output']
@@ -241,11 +249,14 @@ def create_a_file_with_root_in_mntdozersmb2_get_the_file_from_the_smbtest2_share
 
 
 @then('on the Dashboard, click Initiate Failover on the standby controller')
-def on_the_dashboard_click_initiate_failover_on_the_standby_controller(driver):
+def on_the_dashboard_click_initiate_failover_on_the_standby_controller(driver, failover_probes):
     """on the Dashboard, click Initiate Failover on the standby controller."""
     driver.find_element_by_xpath(xpaths.side_Menu.dashboard).click()
     assert wait_on_element(driver, 10, xpaths.dashboard.title)
 
+    # keep I/O going on the writable share during the failover to measure the downtime
+    failover_probes['smb'] = smb_probe(f'//{nas_Hostname}/{writable_Share}', 'ericbsd', 'testing1').start()
+
     rsc.Trigger_Failover(driver)
 
 
@@ -256,14 +267,20 @@ def on_the_initiate_failover_box_check_the_confirm_checkbox_then_click_failover(
 
 
 @then(parsers.parse('wait for the login to appear and HA to be enabled, login with {user} and {password}'))
-def wait_for_the_login_to_appear_and_ha_to_be_enabled_login_with_user_and_password(driver, user, password):
+def wait_for_the_login_to_appear_and_ha_to_be_enabled_login_with_user_and_password(driver, user, password, failover_probes):
     """wait for the login to appear and HA to be enabled, login with <user> and <password>."""
     rsc.HA_Login_Status_Enable(driver)
+    assert failover_tracker.wait_for_api(nas_Hostname, (admin_User, admin_Password))
     rsc.Login(driver, user, password)
     rsc.Verify_The_Dashboard(driver)
     assert wait_on_element(driver, 180, xpaths.toolbar.ha_Enabled)
     # if there is prefious the License Agrement might show up
     rsc.License_Agrement(driver)
+    assert failover_tracker.wait_for_services(nas_Hostname, (admin_User, admin_Password), ['cifs'])
+
+    if 'smb' in failover_probes:
+        report = failover_probes.pop('smb').stop()
+        print('\n'.join(save_failover_report('NAS-T1660', [report])))
 
 
 @then(parsers.parse('verify the first file still exist in {share_name} dataset'))
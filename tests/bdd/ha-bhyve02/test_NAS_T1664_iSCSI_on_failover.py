@@ -6,6 +6,9 @@ import reusableSeleniumCode as rsc
 import string
 import time
 import xpaths
+from failover_phases import failover_tracker
+from failover_probe import directory_probe, save_failover_report
+from integrity import Manifest, generate_corpus, remove_corpus
 from function import (
     wait_on_element,
     wait_on_element_disappear,
@@ -22,6 +25,7 @@ from pytest_bdd import (
     parsers
 )
 from pytest_dependency import depends
+pytestmark = [pytest.mark.exclusive]
 
 MOUNT_POINT = f'/tmp/iscsi_{"".join(random.choices(string.digits, k=3))}'
 
@@ -41,6 +45,11 @@ def checksum():
     return {}
 
 
+@pytest.fixture(scope='module')
+def failover_probes():
+    return {}
+
+
 @scenario('features/NAS-T1664.feature', 'iSCSI sharing and service works after failover')
 def test_iscsi_sharing_and_service_works_after_failover():
     """iSCSI sharing and service works after failover."""
@@ -65,8 +74,7 @@ def on_the_dashboard_click_shares_on_the_left_side_menu(driver):
     """on the Dashboard, click Shares on the left side menu."""
     rsc.Verify_The_Dashboard(driver)
 
-    assert wait_on_element(driver, 5, xpaths.side_Menu.shares, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.shares).click()
+    rsc.Go_To(driver, 'shares')
 
 
 @then('on the Sharing page should appear, click on Block (iSCSI) Shares Targets Wizard button')
@@ -261,18 +269,24 @@ def create_a_file_in_the_mount_point_and_get_the_checksum_of_the_files_to_compar
     test_results = ssh_cmd(cmd, host_info['host_user'], host_info['host_password'], host_info['hostname'])
     assert test_results['result'], str(test_results)
 
-    cmd = f'sha256 {MOUNT_POINT}/testfile.txt'
-    results1 = ssh_cmd(cmd, host_info['host_user'], host_info['host_password'], host_info['hostname'])
-    assert results1['result'], f'{results1["output"]} \n {results1["stderr"]}'
-    checksum['testfile.txt'] = results1["output"].partition('=')[2].strip()
+    corpus_files = generate_corpus(f'{MOUNT_POINT}/integrity_corpus', host_info['host_user'], host_info['host_password'], host_info['hostname'])
+    manifest = Manifest(MOUNT_POINT, host_info['host_user'], host_info['host_password'], host_info['hostname'])
+    manifest.record(['testfile.txt'] + [f'integrity_corpus/{name}' for name in corpus_files])
+    manifest.save('NAS-T1664')
+    checksum['manifest'] = manifest
 
 
 @then('on the Dashboard, click Initiate Failover on the standby controller')
-def on_the_dashboard_click_initiate_failover_on_the_standby_controller(driver):
+def on_the_dashboard_click_initiate_failover_on_the_standby_controller(driver, host_info, failover_probes):
     """on the Dashboard, click Initiate Failover on the standby controller."""
     driver.find_element_by_xpath(xpaths.side_Menu.dashboard).click()
     rsc.Verify_The_Dashboard(driver)
 
+    # keep I/O going on the iSCSI device mount during the failover to measure the downtime
+    failover_probes['iscsi'] = directory_probe(
+        'iSCSI', MOUNT_POINT, host_info['host_user'], host_info['host_password'], host_info['hostname']
+    ).start()
+
     rsc.Trigger_Failover(driver)
 
 
@@ -286,6 +300,7 @@ def on_the_initiate_failover_box_check_the_confirm_checkbox_then_click_failover(
 def wait_for_the_login_to_appear_and_ha_to_be_enabled_login_with_user_and_password(driver, user, password):
     """wait for the login to appear and HA to be enabled, login with <user> and <password>."""
     rsc.HA_Login_Status_Enable(driver)
+    assert failover_tracker.wait_for_api(nas_Hostname, (admin_User, admin_Password))
 
     rsc.Login(driver, user, password)
 
@@ -301,8 +316,9 @@ def once_on_the_dashboard_click_on_system_settings_and_click_services(driver):
 
 
 @then('verify the iSCSI service is RUNNING in the UI and with the API')
-def verify_the_iscsi_service_is_running_in_the_ui_and_with_the_api(driver):
+def verify_the_iscsi_service_is_running_in_the_ui_and_with_the_api(driver, failover_probes):
     """verify the iSCSI service is RUNNING in the UI and with the API."""
+    assert failover_tracker.wait_for_services(nas_Hostname, (admin_User, admin_Password), ['iscsitarget'])
     assert wait_on_element(driver, 7, xpaths.services.title)
     assert wait_on_element(driver, 5, xpaths.services.iscsi_Service_Toggle, 'clickable')
     assert attribute_value_exist(driver, xpaths.services.iscsi_Service_Toggle, 'class', 'mdc-switch--checked')
@@ -310,6 +326,10 @@ def verify_the_iscsi_service_is_running_in_the_ui_and_with_the_api(driver):
     results = get(nas_Hostname, '/service?service=iscsitarget', (admin_User, admin_Password))
     assert results.json()[0]['state'] == 'RUNNING', results.text
 
+    if 'iscsi' in failover_probes:
+        report = failover_probes.pop('iscsi').stop()
+        print('\n'.join(save_failover_report('NAS-T1664', [report])))
+
 
 @then('verify the file verify iSCSI is still connected and the checksum in the mount point')
 def verify_the_file_verify_iscsi_is_still_connected_and_the_checksum_in_the_mount_point(driver, host_info, checksum):
@@ -318,10 +338,9 @@ def verify_the_file_verify_iscsi_is_still_connected_and_the_checksum_in_the_moun
     test_results = ssh_cmd(cmd, host_info['host_user'], host_info['host_password'], host_info['hostname'])
     assert test_results['result'], str(test_results)
 
-    cmd = f'sha256 {MOUNT_POINT}/testfile.txt'
-    results1 = ssh_cmd(cmd, host_info['host_user'], host_info['host_password'], host_info['hostname'])
-    assert results1['result'], f'{results1["output"]} \n {results1["stderr"]}'
-    checksum['testfile.txt'] in results1["output"], f'{results1["output"]} \n {results1["stderr"]}'
+    report = checksum['manifest'].verify()
+    remove_corpus(f'{MOUNT_POINT}/integrity_corpus', host_info['host_user'], host_info['host_password'], host_info['hostname'])
+    assert report['result'], str(report)
 
 
 @then('unmount and remove the mount point, disconnect from the iSCSI target')
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import re
+import shlex
+from ssh_pool import ssh_pool
+
+# <count>x<size> separated by commas, size in bytes or with a K, M or G suffix,
+# about 4.5 MB for every failover test, a larger corpus like
+# '8x512,8x64K,4x4M,2x128M' is set with INTEGRITY_CORPUS
+DEFAULT_CORPUS = '8x512,8x64K,4x1M'
+
+units = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+# sha256sum on Linux and sha256 -r on FreeBSD print "<hash> <file>"
+HASH_COMMAND = 'if command -v sha256sum > /dev/null; then sha256sum "$@"; else sha256 -r "$@"; fi'
+
+
+class IntegrityError(Exception):
+    pass
+
+
+def corpus_sizes(spec=None):
+    """
+    Return the file sizes of a corpus spec like '8x512,4x4M,1x2G', the
+    INTEGRITY_CORPUS environment variable replaces the default corpus.
+    """
+    spec = spec or os.environ.get('INTEGRITY_CORPUS', DEFAULT_CORPUS)
+    sizes = []
+    for part in spec.split(','):
+        match = re.fullmatch(r'\s*(\d+)x(\d+)([KMG]?)\s*', part, re.IGNORECASE)
+        if match is None:
+            raise IntegrityError(f'invalid corpus entry: {part}')
+        count, size, unit = match.groups()
+        sizes += [int(size) * units[unit.upper()]] * int(count)
+    return sizes
+
+
+def _ssh(script, username, password, host, timeout):
+    # sh -c the login shell of the NAS may be csh
+    results = ssh_pool.run(f'sh -c {shlex.quote(script)}', username, password, host, timeout)
+    if not results['result']:
+        raise IntegrityError(f'{results["output"]} \n {results["stderr"]}')
+    return results['output']
+
+
+def generate_corpus(directory, username, password, host, spec=None, timeout=1800):
+    """
+    Create the corpus files of random data in directory on host with one
+    ssh call and return their names.
+    """
+    names = [f'corpus_{index:04d}_{size}.bin' for index, size in enumerate(corpus_sizes(spec))]
+    lines = [f'mkdir -p {shlex.quote(directory)}', f'cd {shlex.quote(directory)} || exit 1']
+    for name in names:
+        size = int(name.rpartition('_')[2].partition('.')[0])
+        lines.append(f'head -c {size} /dev/urandom > {name} &')
+    lines += ['wait', 'sync', 'ls -1 corpus_*.bin | wc -l']
+    output = _ssh('\n'.join(lines), username, password, host, timeout)
+    if int(output.split()[-1]) < len(names):
+        raise IntegrityError(f'only {output.split()[-1]} of {len(names)} corpus files were created')
+    return names
+
+
+def remove_corpus(directory, username, password, host, timeout=300):
+    _ssh(f'rm -rf {shlex.quote(directory)}', username, password, host, timeout)
+
+
+def hash_files(directory, names, username, password, host, parallel=8, timeout=1800):
+    """
+    Return {name: {'size', 'sha256'}} of the files in directory on host,
+    hashed in parallel in one ssh call.
+    """
+    if not names:
+        return {}
+    # the names go through stdin of xargs, the sizes are listed first
+    listing = ' '.join(shlex.quote(name) for name in names)
+    command = (
+        f'cd {shlex.quote(directory)} || exit 1\n'
+        f'for name in {listing}; do [ -f "$name" ] && echo "size $(wc -c < "$name") $name"; done\n'
+        f'printf "%s\\n" {listing} | xargs -P {parallel} -n 1 sh -c {shlex.quote(HASH_COMMAND)} sh 2>/dev/null\n'
+        'exit 0'
+    )
+    output = _ssh(command, username, password, host, timeout)
+    files = {}
+    for line in output.splitlines():
+        fields = line.split(maxsplit=2)
+        if len(fields) == 3 and fields[0] == 'size':
+            files.setdefault(fields[2], {})['size'] = int(fields[1])
+        elif len(fields) == 2 and re.fullmatch('[0-9a-f]{64}', fields[0]):
+            files.setdefault(fields[1].lstrip('*'), {})['sha256'] = fields[0]
+    return files
+
+
+class Manifest:
+    """
+    Hashes of files in a directory taken before a failover and compared
+    with the same files after it.
+    """
+
+    def __init__(self, directory, username, password, host, parallel=8):
+        self.directory = directory
+        self.username = username
+        self.password = password
+        self.host = host
+        self.parallel = parallel
+        self.files = {}
+
+    def record(self, names):
+        self.files = hash_files(self.directory, names, self.username, self.password, self.host, self.parallel)
+        missing = [name for name in names if 'sha256' not in self.files.get(name, {})]
+        if missing:
+            raise IntegrityError(f'could not hash {", ".join(missing)}')
+        return self.files
+
+    def verify(self):
+        """
+        Hash the manifest files again and return the diff report, the
+        result is True when every file is unchanged.
+        """
+        current = hash_files(self.directory, list(self.files), self.username, self.password, self.host, self.parallel)
+        report = {'result': True, 'verified': 0, 'missing': [], 'size_changed': [], 'mismatched': []}
+        for name, expected in self.files.items():
+            found = current.get(name, {})
+            if 'sha256' not in found:
+                report['missing'].append(name)
+            elif found.get('size') != expected['size']:
+                report['size_changed'].append({'name': name, 'expected': expected['size'], 'found': found.get('size')})
+            elif found['sha256'] != expected['sha256']:
+                report['mismatched'].append({'name': name, 'expected': expected['sha256'], 'found': found['sha256']})
+            else:
+                report['verified'] += 1
+        report['result'] = report['verified'] == len(self.files)
+        return report
+
+    def save(self, test_name, directory='results/integrity'):
+        os.makedirs(directory, exist_ok=True)
+        with open(f'{directory}/{test_name}.json', 'w') as outfile:
+            json.dump({'directory': self.directory, 'host': self.host, 'files': self.files}, outfile, indent=2)
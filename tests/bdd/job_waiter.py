@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+import json
+import time
+from uuid import uuid4
+
+try:
+    import websocket
+except ImportError:
+    websocket = None
+
+
+class JobWaiterError(Exception):
+    pass
+
+
+# errors that make wait_On_Job fall back to polling the REST API
+CONNECTION_ERRORS = (JobWaiterError, OSError)
+if websocket is not None:
+    CONNECTION_ERRORS += (websocket.WebSocketException,)
+
+
+def _send(connection, message):
+    connection.send(json.dumps(message))
+
+
+def _call(connection, method, params=None):
+    call_id = str(uuid4())
+    _send(connection, {'id': call_id, 'msg': 'method', 'method': method, 'params': params or []})
+    return call_id
+
+
+def _receive(connection):
+    message = json.loads(connection.recv())
+    if message.get('msg') == 'ping':
+        _send(connection, {'msg': 'pong', 'id': message.get('id')})
+    return message
+
+
+def _result(connection, call_id):
+    while True:
+        message = _receive(connection)
+        if message.get('msg') == 'result' and message.get('id') == call_id:
+            if message.get('error'):
+                raise JobWaiterError(str(message['error']))
+            return message.get('result')
+
+
+def connect(hostname, auth, url=None, timeout=10):
+    """
+    Open an authenticated connection on the middleware websocket, url
+    replace ws://<hostname>/websocket like for a local stand-in server.
+    """
+    if websocket is None:
+        raise JobWaiterError('websocket-client is not installed')
+    connection = websocket.create_connection(url or f'ws://{hostname}/websocket', timeout=timeout)
+    try:
+        _send(connection, {'msg': 'connect', 'version': '1', 'support': ['1']})
+        while _receive(connection).get('msg') != 'connected':
+            pass
+        if _result(connection, _call(connection, 'auth.login', list(auth))) is not True:
+            raise JobWaiterError(f'websocket authentication failed for {auth[0]}')
+    except Exception:
+        connection.close()
+        raise
+    return connection
+
+
+def wait_jobs_on_websocket(hostname, auth, job_ids, max_timeout, progress=None, url=None):
+    """
+    Wait on core.get_jobs events until every job of job_ids is SUCCESS or
+    FAILED and return {job_id: {'state', 'results'}}, progress(job_id,
+    job['progress']) is called on each update.
+    """
+    connection = connect(hostname, auth, url)
+    try:
+        # subscribe before getting the job states, a job can complete
+        # between the two like in ws.service.ts.
+        _send(connection, {'id': str(uuid4()), 'name': 'core.get_jobs', 'msg': 'sub'})
+        get_jobs_id = _call(connection, 'core.get_jobs', [[['id', 'in', list(job_ids)]]])
+        jobs = {job_id: {'id': job_id, 'state': 'WAITING'} for job_id in job_ids}
+        done = {}
+        deadline = time.time() + max_timeout
+        while len(done) < len(jobs):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            connection.settimeout(remaining)
+            try:
+                message = _receive(connection)
+            except websocket.WebSocketTimeoutException:
+                break
+            if message.get('msg') == 'result' and message.get('id') == get_jobs_id:
+                if message.get('error'):
+                    raise JobWaiterError(str(message['error']))
+                updates = message.get('result') or []
+            elif message.get('msg') in ('added', 'changed') and message.get('collection') == 'core.get_jobs':
+                update = message.get('fields') or {}
+                updates = [dict(update, id=update.get('id', message.get('id')))]
+            else:
+                continue
+            for update in updates:
+                job_id = update['id']
+                if job_id not in jobs or job_id in done:
+                    continue
+                jobs[job_id].update(update)
+                if progress is not None and update.get('progress'):
+                    progress(job_id, jobs[job_id]['progress'])
+                if jobs[job_id].get('state') in ('SUCCESS', 'FAILED'):
+                    done[job_id] = {'state': jobs[job_id]['state'], 'results': jobs[job_id]}
+        return {job_id: done.get(job_id, {'state': 'TIMEOUT', 'results': job}) for job_id, job in jobs.items()}
+    finally:
+        connection.close()
+
+
+def wait_job_on_websocket(hostname, auth, job_id, max_timeout, progress=None, url=None):
+    """
+    Wait on core.get_jobs events for job_id and return as soon as it is
+    SUCCESS or FAILED, progress(job['progress']) is called on each update.
+    """
+    job_progress = None if progress is None else lambda job_id, value: progress(value)
+    return wait_jobs_on_websocket(hostname, auth, [job_id], max_timeout, job_progress, url)[job_id]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+import os
+import xpaths
+from function import is_element_present, wait_on_element
+from urllib.parse import urlparse
+
+
+def page_title(title):
+    # the page header shows the title of the route data
+    return f'//h1[normalize-space(text())="{title}"]'
+
+
+# The pages by name with their route in src/app/app.routes.ts and the
+# routing of the page module, the side menu links to click to reach them
+# and the element that shows once the page is ready.
+pages = {
+    'dashboard': {
+        'route': '/dashboard',
+        'menu': [xpaths.side_Menu.dashboard],
+        'ready': xpaths.dashboard.title
+    },
+    'storage': {
+        'route': '/storage',
+        'menu': [xpaths.side_Menu.storage],
+        'ready': xpaths.storage.title
+    },
+    'datasets': {
+        'route': '/datasets',
+        'menu': [xpaths.side_Menu.datasets],
+        'ready': xpaths.dataset.title
+    },
+    'shares': {
+        'route': '/sharing',
+        'menu': [xpaths.side_Menu.shares],
+        'ready': xpaths.sharing.title
+    },
+    'network': {
+        'route': '/network',
+        'menu': [xpaths.side_Menu.network],
+        'ready': xpaths.network.title
+    },
+    'apps': {
+        'route': '/apps',
+        'menu': [xpaths.side_Menu.apps],
+        'ready': xpaths.applications.title
+    },
+    'local_users': {
+        'route': '/credentials/users',
+        'menu': [xpaths.side_Menu.credentials, xpaths.side_Menu.local_User],
+        'ready': xpaths.users.title
+    },
+    'local_groups': {
+        'route': '/credentials/groups',
+        'menu': [xpaths.side_Menu.credentials, xpaths.side_Menu.local_Group],
+        'ready': xpaths.groups.title
+    },
+    'directory_services': {
+        'route': '/credentials/directory-services',
+        'menu': [xpaths.side_Menu.credentials, xpaths.side_Menu.directory_Services],
+        'ready': xpaths.directory_Services.title
+    },
+    'certificates': {
+        'route': '/credentials/certificates',
+        'menu': [xpaths.side_Menu.credentials, xpaths.side_Menu.certificates],
+        'ready': xpaths.certificates.title
+    },
+    'general': {
+        'route': '/system/general',
+        'menu': [xpaths.side_Menu.system_Setting, xpaths.side_Menu.general],
+        'ready': page_title('General')
+    },
+    'advanced': {
+        'route': '/system/advanced',
+        'menu': [xpaths.side_Menu.system_Setting, xpaths.side_Menu.advanced],
+        'ready': xpaths.advanced.title
+    },
+    'failover': {
+        'route': '/system/failover',
+        'menu': [xpaths.side_Menu.system_Setting, xpaths.side_Menu.failover],
+        'ready': page_title('Failover')
+    },
+    'services': {
+        'route': '/system/services',
+        'menu': [xpaths.side_Menu.system_Setting, xpaths.side_Menu.services],
+        'ready': xpaths.services.title
+    }
+}
+
+# Angular router follows the history popstate events, the app moves to the
+# route without loading the page again. The route is under the base href.
+NAVIGATE_SCRIPT = """
+history.pushState(null, '', new URL(arguments[0].replace(/^\\//, ''), document.baseURI).pathname);
+dispatchEvent(new PopStateEvent('popstate', {state: null}));
+"""
+
+
+def use_menu():
+    # NAVIGATION=menu click through the side menu like before
+    return os.environ.get('NAVIGATION') == 'menu'
+
+
+def navigate_to(driver, page, menu=None, wait=30):
+    """
+    Go to page of pages and return True once its ready element shows.
+    The app router is used when the web UI is loaded and the page URL
+    otherwise, with menu=True or NAVIGATION=menu the side menu is clicked
+    for the tests of the navigation itself.
+    """
+    target = pages[page]
+    if use_menu() if menu is None else menu:
+        for xpath in target['menu']:
+            if not wait_on_element(driver, 10, xpath, 'clickable'):
+                return False
+            driver.find_element_by_xpath(xpath).click()
+    elif is_element_present(driver, xpaths.side_Menu.dashboard):
+        driver.execute_script(NAVIGATE_SCRIPT, target['route'])
+    else:
+        driver.get(f'http://{urlparse(driver.current_url).netloc}/ui{target["route"]}')
+    return wait_on_element(driver, wait, target['ready'])
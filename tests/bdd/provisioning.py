@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+import asyncio
+from api_client import RestClient
+from urllib.parse import quote
+
+# api/v2.0 endpoint of each resource type
+endpoints = {
+    'groups': 'group',
+    'users': 'user',
+    'datasets': 'pool/dataset',
+    'smb_shares': 'sharing/smb',
+    'nfs_shares': 'sharing/nfs'
+}
+
+# groups before the users that can use them, datasets before their shares
+creation_order = ['groups', 'users', 'datasets', 'smb_shares', 'nfs_shares']
+
+
+def dataset_levels(items, name):
+    levels = sorted({name(item).count('/') for item in items})
+    return [[item for item in items if name(item).count('/') == level] for level in levels]
+
+
+class ProvisioningError(Exception):
+    def __init__(self, failures, created):
+        self.failures = failures
+        self.created = created
+        super().__init__('\n'.join(f'{resource} {payload}: {error}' for resource, payload, error in failures))
+
+
+class Provisioner:
+    """
+    Create and delete users, groups, datasets and shares concurrently over
+    api/v2.0, at most concurrency calls are in flight at once.
+    """
+
+    def __init__(self, host, auth, concurrency=20):
+        self.auth = auth
+        self.concurrency = concurrency
+        self.client = RestClient(host, pool_size=concurrency)
+
+    async def _run(self, calls):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def limited(call):
+            async with semaphore:
+                return await asyncio.to_thread(*call)
+
+        return await asyncio.gather(*(limited(call) for call in calls), return_exceptions=True)
+
+    async def create(self, resource, payloads):
+        """
+        Return (ids, failures) for the payloads created on resource.
+        """
+        endpoint = endpoints[resource]
+        if resource == 'datasets':
+            # parents need to exist before their children
+            batches = dataset_levels(payloads, lambda payload: payload['name'])
+        else:
+            batches = [payloads]
+        ids = []
+        failures = []
+        for batch in batches:
+            responses = await self._run([(self.client.post, f'{endpoint}/', self.auth, payload) for payload in batch])
+            for payload, response in zip(batch, responses):
+                if isinstance(response, Exception):
+                    failures.append((resource, payload, str(response)))
+                elif response.status_code != 200:
+                    failures.append((resource, payload, response.text))
+                else:
+                    created = response.json()
+                    ids.append(created['id'] if isinstance(created, dict) else created)
+        return ids, failures
+
+    async def delete(self, resource, ids):
+        """
+        Return the failures deleting ids from resource.
+        """
+        endpoint = endpoints[resource]
+        if resource == 'datasets':
+            # delete the children before their parents
+            batches = list(reversed(dataset_levels(ids, lambda name: name)))
+            payload = {'recursive': True}
+        else:
+            batches = [ids]
+            payload = None
+        failures = []
+        for batch in batches:
+            responses = await self._run([
+                (self.client.delete, f'{endpoint}/id/{quote(str(resource_id), safe="")}/', self.auth, payload)
+                for resource_id in batch
+            ])
+            for resource_id, response in zip(batch, responses):
+                if isinstance(response, Exception):
+                    failures.append((resource, resource_id, str(response)))
+                elif response.status_code != 200:
+                    failures.append((resource, resource_id, response.text))
+        return failures
+
+    async def provision(self, **payloads):
+        created = {}
+        failures = []
+        for resource in creation_order:
+            if payloads.get(resource):
+                created[resource], resource_failures = await self.create(resource, payloads[resource])
+                failures += resource_failures
+        if failures:
+            raise ProvisioningError(failures, created)
+        return created
+
+    async def teardown(self, created):
+        failures = []
+        for resource in reversed(creation_order):
+            if created.get(resource):
+                failures += await self.delete(resource, created[resource])
+        if failures:
+            raise ProvisioningError(failures, {})
+
+
+def provision(host, auth, concurrency=20, **payloads):
+    """
+    Create the resources given as lists of api/v2.0 payloads, like
+    provision(nas_ip, auth, groups=[...], users=[...], datasets=[...]),
+    and return {resource: [created ids]} for teardown().
+    """
+    provisioner = Provisioner(host, auth, concurrency)
+    try:
+        return asyncio.run(provisioner.provision(**payloads))
+    finally:
+        provisioner.client.close()
+
+
+def teardown(host, auth, created, concurrency=20):
+    provisioner = Provisioner(host, auth, concurrency)
+    try:
+        asyncio.run(provisioner.teardown(created))
+    finally:
+        provisioner.client.close()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+import os
+import shlex
+import threading
+from ssh_pool import ssh_pool
+from subprocess import Popen, DEVNULL, PIPE
+
+
+class RemoteLog:
+    """
+    Copy the new bytes of a remote log to results/logs/<node>-<log name>,
+    the byte offset and inode are kept per node so the capture goes on
+    when the other controller answers after a failover.
+    """
+
+    def __init__(self, path, username, password, host, local_dir='results/logs',
+                 chunk_size=1024 * 1024, new_node_tail=1024 * 1024, timeout=300):
+        self.path = path
+        self.username = username
+        self.password = password
+        self.host = host
+        self.local_dir = local_dir
+        self.chunk_size = chunk_size
+        # how much of the existing log to copy from a node seen for the first time
+        self.new_node_tail = new_node_tail
+        self.timeout = timeout
+        self.nodes = {}
+
+    def local_file(self, node):
+        return f'{self.local_dir}/{node}-{os.path.basename(self.path)}'
+
+    def _stat(self, path):
+        # the machine-id tells the controllers apart behind the same hostname,
+        # stat -f is the stat of FreeBSD and sh -c the login shell may be csh
+        script = (f"cat /etc/machine-id 2>/dev/null || hostname; "
+                  f"stat -c '%i %s' {shlex.quote(path)} 2>/dev/null || stat -f '%i %z' {shlex.quote(path)}")
+        results = ssh_pool.run(f'sh -c {shlex.quote(script)}', self.username, self.password, self.host, 30)
+        if not results['result']:
+            return None
+        node, stat = results['output'].split('\n')[:2]
+        inode, size = stat.split()
+        return node.strip(), int(inode), int(size)
+
+    def _stream(self, path, offset, length, node):
+        """
+        Append length bytes of path from offset to the local copy, return the
+        bytes copied or None when the ssh command failed.
+        """
+        # tail -c +N seek to the offset, only the new bytes go over the wire
+        script = f'tail -c +{offset + 1} {shlex.quote(path)} | head -c {length}'
+        if not ssh_pool.connect(self.username, self.password, self.host):
+            return None
+        cmd = ['ssh', *ssh_pool.options(self.username, self.host), '-o', 'BatchMode=yes',
+               f'{self.username}@{self.host}', f'sh -c {shlex.quote(script)}']
+        local_file = self.local_file(node)
+        start = os.path.getsize(local_file) if os.path.exists(local_file) else 0
+        process = Popen(cmd, stdin=DEVNULL, stdout=PIPE, stderr=DEVNULL)
+        # a controller that goes away during the copy must not hang the fetch
+        timer = threading.Timer(self.timeout, process.kill)
+        timer.start()
+        copied = 0
+        try:
+            with open(local_file, 'ab') as local_log:
+                for chunk in iter(lambda: process.stdout.read(self.chunk_size), b''):
+                    local_log.write(chunk)
+                    copied += len(chunk)
+        finally:
+            timer.cancel()
+            process.wait()
+        if process.returncode != 0:
+            # drop the partial copy, the next fetch copies it again
+            with open(local_file, 'ab') as local_log:
+                local_log.truncate(start)
+            return None
+        return copied
+
+    def fetch(self):
+        """
+        Copy what was written since the last fetch on the node answering
+        on host, return {'result', 'node', 'bytes'}.
+        """
+        os.makedirs(self.local_dir, exist_ok=True)
+        stat = self._stat(self.path)
+        if stat is None:
+            return {'result': False, 'node': None, 'bytes': 0}
+        node, inode, size = stat
+        position = self.nodes.get(node)
+        copied = 0
+        if position is None:
+            offset = max(size - self.new_node_tail, 0)
+        elif position['inode'] != inode:
+            # the log was rotated, finish the old file if it is still there
+            rotated = self._stat(f'{self.path}.1')
+            if rotated is not None and rotated[1] == position['inode'] and rotated[2] > position['offset']:
+                streamed = self._stream(f'{self.path}.1', position['offset'], rotated[2] - position['offset'], node)
+                if streamed is None:
+                    return {'result': False, 'node': node, 'bytes': 0}
+                copied += streamed
+            self.nodes[node] = {'inode': inode, 'offset': 0}
+            offset = 0
+        elif size < position['offset']:
+            # the log was truncated
+            offset = 0
+        else:
+            offset = position['offset']
+        streamed = self._stream(self.path, offset, size - offset, node) if size > offset else 0
+        if streamed is None:
+            # keep the offset, the next fetch copies these bytes again
+            return {'result': False, 'node': node, 'bytes': copied}
+        if not os.path.exists(self.local_file(node)):
+            open(self.local_file(node), 'ab').close()
+        self.nodes[node] = {'inode': inode, 'offset': offset + streamed}
+        return {'result': True, 'node': node, 'bytes': copied + streamed}
+
+    def checkpoint(self):
+        """
+        Fetch and return the local size of each node log to use with delta().
+        """
+        self.fetch()
+        return {node: os.path.getsize(self.local_file(node)) for node in self.nodes}
+
+    def delta(self, checkpoint):
+        """
+        Return {node: text written since checkpoint} from the local copies.
+        """
+        texts = {}
+        for node in self.nodes:
+            with open(self.local_file(node), 'rb') as local_log:
+                local_log.seek(checkpoint.get(node, 0))
+                texts[node] = local_log.read().decode('utf-8', errors='replace')
+        return texts
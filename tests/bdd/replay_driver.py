@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+import lxml.html
+from dom_probe import FIND_SCRIPT, PROBE_SCRIPT
+from dom_wait import IDLE_SCRIPT, WAIT_SCRIPT
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+EMPTY_PAGE = '<html><head></head><body></body></html>'
+
+
+def _text(element):
+    return ' '.join(element.text_content().split())
+
+
+def _visible(element):
+    return element.get('data-snapshot-hidden') is None
+
+
+def _enabled(element):
+    return element.get('disabled') is None and not element.xpath('ancestor::fieldset[@disabled]')
+
+
+class ReplayElement:
+    """
+    The WebElement calls the steps use, read from a snapshot. The actions
+    change nothing and are only logged on the driver.
+    """
+
+    def __init__(self, driver, element):
+        self._driver = driver
+        self._element = element
+
+    @property
+    def tag_name(self):
+        return self._element.tag
+
+    @property
+    def text(self):
+        return _text(self._element) if _visible(self._element) else ''
+
+    def get_attribute(self, name):
+        return self._element.get(name)
+
+    get_property = get_attribute
+
+    def is_displayed(self):
+        return _visible(self._element)
+
+    def is_enabled(self):
+        return _enabled(self._element)
+
+    def is_selected(self):
+        return self._element.get('checked') is not None or 'true' in (self._element.get('aria-checked'), self._element.get('aria-selected'))
+
+    def click(self):
+        self._driver.actions.append(('click', self._element.getroottree().getpath(self._element)))
+
+    def clear(self):
+        self._driver.actions.append(('clear', self._element.getroottree().getpath(self._element)))
+
+    def send_keys(self, *value):
+        self._driver.actions.append(('send_keys', self._element.getroottree().getpath(self._element), ''.join(map(str, value))))
+
+    def find_element_by_xpath(self, xpath):
+        elements = self.find_elements_by_xpath(xpath)
+        if not elements:
+            raise NoSuchElementException(f'Unable to locate element: {xpath}')
+        return elements[0]
+
+    def find_elements_by_xpath(self, xpath):
+        return [ReplayElement(self._driver, element) for element in self._element.xpath(xpath)]
+
+
+class ReplayDriver:
+    """
+    Run the steps on the DOM snapshots saved with DOM_SNAPSHOTS=capture
+    instead of a browser. A step starts on the page saved after the step
+    before it and moves to the page saved after itself the first time a
+    lookup or a wait does not succeed, like the page changed after its
+    clicks. The scripts of the wait and probe helpers are answered with
+    lxml, any other script raises NotImplementedError.
+    """
+
+    def __init__(self, pages=()):
+        self.actions = []
+        self.scripts = {
+            FIND_SCRIPT: self._find_script,
+            PROBE_SCRIPT: self._probe_script,
+            WAIT_SCRIPT: self._wait_script,
+            IDLE_SCRIPT: lambda *arguments: True
+        }
+        self.replay(pages)
+
+    def replay(self, pages):
+        self.pages = list(pages) or [None]
+        self.position = 0
+        self.documents = {}
+
+    @property
+    def document(self):
+        if self.position not in self.documents:
+            path = self.pages[self.position]
+            if path is None:
+                self.documents[self.position] = lxml.html.document_fromstring(EMPTY_PAGE)
+            else:
+                self.documents[self.position] = lxml.html.parse(path).getroot()
+        return self.documents[self.position]
+
+    def _advance(self):
+        if self.position + 1 >= len(self.pages):
+            return False
+        self.position += 1
+        return True
+
+    def _until(self, check):
+        while not check():
+            if not self._advance():
+                return False
+        return True
+
+    def _find_all(self, xpath):
+        return self.document.xpath(xpath)
+
+    def _state(self, elements):
+        element = elements[0] if elements else None
+        return {
+            'present': element is not None,
+            'visible': element is not None and _visible(element),
+            'enabled': element is not None and _enabled(element),
+            'text': _text(element) if element is not None else None
+        }
+
+    def _find_script(self, xpath, css=None):
+        self._until(lambda: bool(self._find_all(xpath)))
+        elements = self._find_all(xpath)
+        return ReplayElement(self, elements[0]) if elements else None
+
+    def _probe_script(self, selectors):
+        return {name: self._state(self._find_all(xpath)) for name, xpath in selectors.items()}
+
+    def _wait_script(self, xpath, condition=None, attribute=None, value=None, timeout=None, css=None):
+        def check():
+            elements = self._find_all(xpath)
+            state = self._state(elements)
+            if condition == 'gone':
+                return not state['present']
+            if condition == 'presence':
+                return state['present']
+            if condition == 'attribute':
+                return state['present'] and value in (elements[0].get(attribute) or '')
+            if condition in ('clickable', 'inputable'):
+                return state['visible'] and state['enabled']
+            return state['visible']
+        return self._until(check)
+
+    def execute_script(self, script, *arguments):
+        # like Scroll_To, nothing to scroll on a snapshot
+        if 'scrollIntoView' in script:
+            return None
+        if script not in self.scripts:
+            raise NotImplementedError(f'the replay driver does not run: {script.strip()[:80]}')
+        return self.scripts[script](*arguments)
+
+    execute_async_script = execute_script
+
+    def execute(self, command, params=None):
+        # the ActionChains commands
+        self.actions.append((command, params))
+        return {'value': None}
+
+    def find_element_by_xpath(self, xpath):
+        element = self._find_script(xpath)
+        if element is None:
+            raise NoSuchElementException(f'Unable to locate element: {xpath}')
+        return element
+
+    def find_elements_by_xpath(self, xpath):
+        self._until(lambda: bool(self._find_all(xpath)))
+        return [ReplayElement(self, element) for element in self._find_all(xpath)]
+
+    def find_element(self, by=By.XPATH, value=None):
+        if by == By.ID:
+            return self.find_element_by_xpath(f'//*[@id="{value}"]')
+        if by != By.XPATH:
+            raise NotImplementedError(f'the replay driver only finds elements by XPath or id, not {by}')
+        return self.find_element_by_xpath(value)
+
+    def find_elements(self, by=By.XPATH, value=None):
+        if by != By.XPATH:
+            raise NotImplementedError(f'the replay driver only finds elements by XPath, not {by}')
+        return self.find_elements_by_xpath(value)
+
+    @property
+    def current_url(self):
+        urls = self.document.xpath('//meta[@name="snapshot-url"]/@content')
+        return urls[0] if urls else 'about:blank'
+
+    @property
+    def title(self):
+        return self.document.findtext('.//title') or ''
+
+    def get(self, url):
+        self.actions.append(('get', url))
+
+    def refresh(self):
+        self.actions.append(('refresh', None))
+
+    def save_screenshot(self, name):
+        return True
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def set_window_size(self, width, height):
+        pass
+
+    def quit(self):
+        pass
@@ -1,11 +1,18 @@
 
-import time
 import xpaths
+from alert_watcher import degraded_pool, dismiss_all_alerts, wait_for_alert
+from dom_probe import wait_for_probe
+from failover_phases import failover_tracker
 from function import (
     is_element_present,
+    reset_ssh_connections,
+    settle,
     wait_on_element,
     wait_on_element_disappear
 )
+from navigator import navigate_to
+from table_reader import read_table
+from token_login import token_login, use_token_login
 
 
 def Click_Clear_Input(driver, xpath, value):
@@ -47,7 +54,12 @@ def Confirm_Failover(driver):
     driver.find_element_by_xpath('//mat-checkbox[contains(@class,"confirm-checkbox")]').click()
     assert wait_on_element(driver, 5, '//button[span/text()=" Failover "]', 'clickable')
     driver.find_element_by_xpath('//button[span/text()=" Failover "]').click()
-    time.sleep(10)
+    failover_tracker.start()
+    # the ssh connections are on the controller going to standby
+    reset_ssh_connections()
+    # the UI leaves the dashboard when it loses the middleware connection
+    if wait_on_element_disappear(driver, 60, xpaths.side_Menu.dashboard):
+        failover_tracker.mark('ui_disconnected')
 
 
 def Confirm_Single_Disk(driver):
@@ -64,18 +76,14 @@ def Confirm_Warning(driver):
     driver.find_element_by_xpath(xpaths.checkbox.new_Confirm).click()
     assert wait_on_element(driver, 5, xpaths.button.Continue, 'clickable')
     driver.find_element_by_xpath(xpaths.button.Continue).click()
-    time.sleep(1)
+    settle(driver, 1)
 
 
-def Dismiss_All_Alerts(driver):
-    if wait_on_element(driver, 5, '//span[contains(.,"notifications")]//span[not(contains(text(),"0"))]'):
-        assert wait_on_element(driver, 7, xpaths.toolbar.notification_Button, 'clickable')
-        driver.find_element_by_xpath(xpaths.toolbar.notification_Button).click()
-        assert wait_on_element(driver, 7, xpaths.alert.title)
-        assert wait_on_element(driver, 7, '//button[contains(text(),"Dismiss All Alerts")]', 'clickable')
-        driver.find_element_by_xpath('//button[contains(text(),"Dismiss All Alerts")]').click()
-        assert wait_on_element(driver, 7, '//ix-icon[contains(.,"clear")]', 'clickable')
-        driver.find_element_by_xpath('//ix-icon[contains(.,"clear")]').click()
+def Dismiss_All_Alerts(driver, nas_hostname, auth):
+    failed = dismiss_all_alerts(nas_hostname, auth)
+    assert failed == [], failed
+    # the badge count follows the alert.list subscription of the UI
+    assert wait_on_element_disappear(driver, 30, '//span[contains(.,"notifications")]//span[not(contains(text(),"0"))]')
 
 
 def Encyrpted_Key_Waring(driver):
@@ -84,16 +92,20 @@ def Encyrpted_Key_Waring(driver):
     driver.find_element_by_xpath(xpaths.button.done).click()
 
 
+def Go_To(driver, page):
+    assert navigate_to(driver, page), f'the {page} page did not show'
+
+
 def Go_To_Service(driver):
-    driver.find_element_by_xpath(xpaths.side_Menu.system_Setting).click()
-    assert wait_on_element(driver, 5, xpaths.side_Menu.services, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.services).click()
+    Go_To(driver, 'services')
 
 
 def HA_Login_Status_Enable(driver):
-    wait_on_element(driver, 180, xpaths.login.user_Input)
+    if wait_on_element(driver, 180, xpaths.login.user_Input):
+        failover_tracker.mark('login_page')
     driver.refresh()
     assert wait_on_element(driver, 180, xpaths.login.ha_Status_Enable)
+    failover_tracker.mark('ha_enabled')
 
 
 def Input_Value(driver, xpath, value):
@@ -118,7 +130,10 @@ def License_Agrement(driver):
 
 
 def Login(driver, user, password):
-    time.sleep(1)
+    # after a failover or a reboot the UI is logged in again with a new token
+    if use_token_login() and token_login(driver, (user, password)):
+        return
+    settle(driver, 1)
     driver.find_element_by_xpath(xpaths.login.user_Input).clear()
     driver.find_element_by_xpath(xpaths.login.user_Input).send_keys(user)
     driver.find_element_by_xpath(xpaths.login.password_Input).clear()
@@ -129,6 +144,8 @@ def Login(driver, user, password):
 
 def Login_If_Not_On_Dashboard(driver, user, password):
     if not is_element_present(driver, xpaths.side_Menu.dashboard):
+        if use_token_login() and token_login(driver, (user, password)):
+            return
         assert wait_on_element(driver, 10, xpaths.login.user_Input)
         driver.find_element_by_xpath(xpaths.login.user_Input).clear()
         driver.find_element_by_xpath(xpaths.login.user_Input).send_keys(user)
@@ -156,7 +173,7 @@ def Return_To_Pool_list(driver):
 def Scroll_To(driver, xpath):
     element = driver.find_element_by_xpath(xpath)
     driver.execute_script("arguments[0].scrollIntoView();", element)
-    time.sleep(0.5)
+    settle(driver, 0.5)
 
 
 def Select_Option(driver, xpath):
@@ -192,38 +209,32 @@ def Trigger_Failover(driver):
     driver.find_element_by_xpath(xpaths.button.initiate_Failover).click()
 
 
-def Verify_Degraded_Alert(driver):
-    for _ in range(180):
-        assert wait_on_element(driver, 5, xpaths.toolbar.notification_Button, 'clickable')
-        driver.find_element_by_xpath(xpaths.toolbar.notification_Button).click()
-        assert wait_on_element(driver, 5, xpaths.alert.panel_Open)
-        if wait_on_element(driver, 3, xpaths.alert.degraded_Critical_Level):
-            break
-        assert wait_on_element(driver, 5, xpaths.alert.close_Button, 'clickable')
-        driver.find_element_by_xpath(xpaths.alert.close_Button).click()
-        assert wait_on_element_disappear(driver, 5, xpaths.alert.panel_Open)
+def Verify_Degraded_Alert(driver, nas_hostname, auth):
+    results = wait_for_alert(nas_hostname, auth, degraded_pool('tank'))
+    assert results['result'], 'The tank DEGRADED alert did not appear'
 
+    assert wait_on_element(driver, 5, xpaths.toolbar.notification_Button, 'clickable')
+    driver.find_element_by_xpath(xpaths.toolbar.notification_Button).click()
+    assert wait_on_element(driver, 5, xpaths.alert.panel_Open)
+    assert wait_on_element(driver, 30, xpaths.alert.degraded_Critical_Level)
     assert is_element_present(driver, xpaths.alert.degraded_Pool_Text)
     assert wait_on_element(driver, 5, xpaths.alert.close_Button, 'clickable')
     driver.find_element_by_xpath(xpaths.alert.close_Button).click()
-    time.sleep(0.5)
+    settle(driver, 0.5)
 
 
-def Verify_Degraded_Alert_Is_Gone(driver):
-    for _ in range(180):
-        assert wait_on_element(driver, 5, xpaths.toolbar.notification_Button, 'clickable')
-        driver.find_element_by_xpath(xpaths.toolbar.notification_Button).click()
-        assert wait_on_element(driver, 5, xpaths.alert.panel_Open)
-        if is_element_present(driver, xpaths.alert.degraded_Critical_Level) is False:
-            break
-        assert wait_on_element(driver, 5, xpaths.alert.close_Button, 'clickable')
-        driver.find_element_by_xpath(xpaths.alert.close_Button).click()
-        assert wait_on_element_disappear(driver, 5, xpaths.alert.panel_Open)
+def Verify_Degraded_Alert_Is_Gone(driver, nas_hostname, auth):
+    results = wait_for_alert(nas_hostname, auth, degraded_pool('tank'), present=False)
+    assert results['result'], results['alerts']
 
+    assert wait_on_element(driver, 5, xpaths.toolbar.notification_Button, 'clickable')
+    driver.find_element_by_xpath(xpaths.toolbar.notification_Button).click()
+    assert wait_on_element(driver, 5, xpaths.alert.panel_Open)
+    assert wait_on_element_disappear(driver, 30, xpaths.alert.degraded_Critical_Level)
     assert is_element_present(driver, xpaths.alert.degraded_Pool_Text) is False
     assert wait_on_element(driver, 5, xpaths.alert.close_Button, 'clickable')
     driver.find_element_by_xpath(xpaths.alert.close_Button).click()
-    time.sleep(0.5)
+    settle(driver, 0.5)
 
 
 def Verify_Element_Text(driver, xpath, value):
@@ -232,8 +243,11 @@ def Verify_Element_Text(driver, xpath, value):
 
 
 def Verify_The_Dashboard(driver):
-    assert wait_on_element(driver, 10, xpaths.dashboard.title)
-    assert wait_on_element(driver, 15, xpaths.dashboard.system_Info_Card_Title)
+    dashboard = {
+        'title': xpaths.dashboard.title,
+        'system_Info_Card': xpaths.dashboard.system_Info_Card_Title
+    }
+    assert wait_for_probe(driver, 15, dashboard, lambda page: page['title']['visible'] and page['system_Info_Card']['visible'])
 
 
 def Wait_For_Inputable_And_Input_Value(driver, xpath, value):
@@ -243,11 +257,10 @@ def Wait_For_Inputable_And_Input_Value(driver, xpath, value):
 
 
 def Wiped_Unused_Disk(driver):
-    disk_list = []
-    disk_elements = driver.find_elements_by_xpath(xpaths.disks.all_Disk)
-    for disk_element in disk_elements:
-        if is_element_present(driver, f'//tr[contains(.,"{disk_element.text}")]//div[contains(text(),"N/A") or contains(text(),"Exported")]'):
-            disk_list.append(disk_element.text)
+    disks = read_table(driver)
+    disks.load_all()
+    unused = disks.find(lambda row: (row.get('Pool') or '').strip() in ('N/A', 'Exported'))
+    disk_list = [row.get('Name').strip() for row in unused if row.get('Name')]
     for disk in disk_list:
         assert wait_on_element(driver, 7, xpaths.disks.disk_Expander(disk), 'clickable')
         driver.find_element_by_xpath(xpaths.disks.disk_Expander(disk)).click()
@@ -266,4 +279,4 @@ def Wiped_Unused_Disk(driver):
         assert wait_on_element(driver, 5, xpaths.button.close, 'clickable')
         driver.find_element_by_xpath(xpaths.button.close).click()
         assert wait_on_element_disappear(driver, 7, xpaths.disks.confirm_Box_Title(disk))
-        time.sleep(1)
+        settle(driver, 1)
@@ -5,7 +5,18 @@ import os
 import getopt
 import json
 from configparser import ConfigParser
-from subprocess import run
+from subprocess import run, Popen
+from xml.etree import ElementTree
+from scheduler import (
+    dependency_chains,
+    dependency_graph,
+    descendants,
+    is_setup_test,
+    list_test_files,
+    scan_dependencies,
+    schedule_workers
+)
+from selector_index import check_selectors, print_report, src_app
 cwd = str(os.getcwd())
 screenshot_path = f"{cwd}/screenshot"
 argument = sys.argv
@@ -21,6 +32,39 @@ Options:
                                    is use by default. test-suite options:
                                    ha-bhyve02, ha-tn09, scale, scale-validation
 --marker      <marker>           - Pytest markers to use like debug_test
+--wait-for-idle                  - Replace the fixed settle sleeps with a wait
+                                   until the web UI is idle.
+--workers     <number>           - Split the test suite across <number>
+                                   pytest processes, each one with its own
+                                   browser. The setup tests (test_001_...)
+                                   always run first in a single process,
+                                   then each chain of dependent tests runs
+                                   on a single worker. The tests marked
+                                   exclusive, like the failovers, run alone
+                                   after the workers.
+--prewarm-browsers <number>      - Start <number> browsers in the background
+                                   while pytest collects the tests, a
+                                   browser that crashes is replaced by the
+                                   next one.
+--fast-profile                   - Run a headless Firefox without animations,
+                                   web fonts and images, the download
+                                   settings stay the same.
+--ui-login                       - Log in with the sign-in form instead of
+                                   an API token put in the browser storage.
+--menu-navigation                - Go to the pages by clicking the side menu
+                                   instead of the app routes.
+--trace-commands                 - Time the WebDriver, REST, ssh and shell
+                                   calls and the sleeps of each step in a
+                                   Chrome trace per test in results/traces
+                                   with the slowest steps and selectors.
+--capture-dom                    - Save the DOM after each step in
+                                   results/dom_snapshots.
+--replay-dom                     - Run the steps on the DOM saved with
+                                   --capture-dom without a browser, the
+                                   clicks and typing do nothing.
+--check-selectors                - Only check the XPaths of the test suite
+                                   against the web UI templates in src/app
+                                   and exit with 1 if any is stale.
 """
 
 
@@ -32,7 +76,17 @@ option_list = [
     'convert-feature',
     'test-suite=',
     'iso-version=',
-    'marker='
+    'marker=',
+    'wait-for-idle',
+    'workers=',
+    'check-selectors',
+    'prewarm-browsers=',
+    'fast-profile',
+    'ui-login',
+    'menu-navigation',
+    'trace-commands',
+    'capture-dom',
+    'replay-dom'
 ]
 
 test_suite_list = [
@@ -87,7 +141,9 @@ except getopt.GetoptError as e:
 global ip, password
 test_suite = 'scale'
 run_convert = False
+selectors_only = False
 marker = ''
+workers = 1
 
 for output, arg in myopts:
     if output == '--ip':
@@ -117,6 +173,156 @@ for output, arg in myopts:
             print('Here is the list supported markers:\n',
                   markers_list)
             exit(1)
+    elif output == '--wait-for-idle':
+        os.environ['SETTLE_MODE'] = 'idle'
+    elif output == '--workers':
+        if arg.isdigit() and int(arg) > 0:
+            workers = int(arg)
+        else:
+            print(f'--workers {arg} is not valid, it needs to be a number above 0')
+            exit(1)
+    elif output == '--prewarm-browsers':
+        if arg.isdigit():
+            os.environ['BROWSER_PREWARM'] = arg
+        else:
+            print(f'--prewarm-browsers {arg} is not valid, it needs to be a number')
+            exit(1)
+    elif output == '--fast-profile':
+        os.environ['BROWSER_PROFILE'] = 'fast'
+    elif output == '--ui-login':
+        os.environ['LOGIN_MODE'] = 'ui'
+    elif output == '--menu-navigation':
+        os.environ['NAVIGATION'] = 'menu'
+    elif output == '--trace-commands':
+        os.environ['TRACE_COMMANDS'] = '1'
+    elif output == '--capture-dom':
+        os.environ['DOM_SNAPSHOTS'] = 'capture'
+    elif output == '--replay-dom':
+        os.environ['DOM_SNAPSHOTS'] = 'replay'
+    elif output == '--check-selectors':
+        selectors_only = True
+
+
+def pytest_command(test_targets, junit_file, cucumber_file):
+    pytest_cmd = [
+        sys.executable,
+        '-m',
+        'pytest',
+        '-v',
+        *test_targets,
+        f"--junitxml={junit_file}",
+        f"--cucumber-json={cucumber_file}"
+    ]
+    if marker:
+        pytest_cmd.append("-k")
+        pytest_cmd.append(marker)
+    return pytest_cmd
+
+
+def merge_junit_results(junit_files, merged_file, skipped_files=()):
+    merged = ElementTree.Element('testsuites')
+    merged_suite = ElementTree.SubElement(merged, 'testsuite', name='pytest')
+    totals = {'errors': 0, 'failures': 0, 'skipped': 0, 'tests': 0}
+    duration = 0.0
+    for junit_file in junit_files:
+        if not os.path.exists(junit_file):
+            continue
+        for suite in ElementTree.parse(junit_file).getroot().iter('testsuite'):
+            for key in totals:
+                totals[key] += int(suite.get(key, 0))
+            duration += float(suite.get('time', 0))
+            merged_suite.extend(list(suite))
+    for skipped_file in skipped_files:
+        testcase = ElementTree.SubElement(merged_suite, 'testcase', classname=skipped_file, name=os.path.basename(skipped_file), time='0')
+        ElementTree.SubElement(testcase, 'skipped', message='a dependency of this test failed during setup')
+        totals['tests'] += 1
+        totals['skipped'] += 1
+    for key, value in totals.items():
+        merged_suite.set(key, str(value))
+    merged_suite.set('time', f'{duration:.3f}')
+    ElementTree.ElementTree(merged).write(merged_file, encoding='utf-8', xml_declaration=True)
+
+
+def merge_cucumber_results(cucumber_files, merged_file):
+    merged = []
+    for cucumber_file in cucumber_files:
+        if os.path.exists(cucumber_file):
+            with open(cucumber_file, 'r') as results:
+                merged += json.load(results)
+    with open(merged_file, 'w') as outfile:
+        json.dump(merged, outfile)
+
+
+def run_workers(directory, worker_count):
+    os.makedirs('results/junit', exist_ok=True)
+    os.makedirs('results/workers', exist_ok=True)
+    test_files = list_test_files(directory)
+    setup_files = [test_file for test_file in test_files if is_setup_test(test_file)]
+    junit_files = []
+    cucumber_files = []
+
+    # run the setup tests first and share the dependencies that passed
+    # with the workers.
+    passed_dependencies = []
+    if setup_files:
+        junit_files.append('results/junit/webui_test_setup.xml')
+        cucumber_files.append('results/cucumber/webui_test_setup.json')
+        worker_env = dict(os.environ, DEPENDENCY_RESULTS='results/workers/setup_dependencies.json')
+        run(pytest_command(setup_files, junit_files[-1], cucumber_files[-1]), env=worker_env)
+        if os.path.exists('results/workers/setup_dependencies.json'):
+            with open('results/workers/setup_dependencies.json', 'r') as dependencies:
+                passed_dependencies = json.load(dependencies)['passed']
+
+    # tests depending on a setup test that did not pass are skipped
+    # without starting a browser for them.
+    graph = dependency_graph(test_files)
+    failed_setup = [
+        setup_file for setup_file in setup_files
+        if not scan_dependencies(setup_file)['provides'] <= set(passed_dependencies)
+    ]
+    skipped_files = sorted(descendants(graph, failed_setup) - set(setup_files))
+    for skipped_file in skipped_files:
+        print(f'skipping {skipped_file}, it depends on a failed setup test')
+    worker_graph = {
+        test_file: parents - set(setup_files) for test_file, parents in graph.items()
+        if test_file not in setup_files and test_file not in skipped_files
+    }
+    shards, exclusive_files = schedule_workers(dependency_chains(worker_graph), worker_count)
+    processes = []
+    for number, shard in enumerate(shards, start=1):
+        junit_files.append(f'results/junit/webui_test_worker{number}.xml')
+        cucumber_files.append(f'results/cucumber/webui_test_worker{number}.json')
+        worker_env = dict(os.environ, SATISFIED_DEPENDENCIES=','.join(passed_dependencies))
+        log_file = open(f'results/workers/worker{number}.log', 'w')
+        print(f'worker {number}: {len(shard)} test files, log in {log_file.name}')
+        process = Popen(pytest_command(shard, junit_files[-1], cucumber_files[-1]),
+                        env=worker_env, stdout=log_file, stderr=log_file)
+        processes.append((process, log_file))
+    for process, log_file in processes:
+        process.wait()
+        log_file.close()
+
+    # the failover, reboot and disk tests break the browser, ssh and API
+    # sessions of the other workers, they run alone once the workers are done.
+    if exclusive_files:
+        print(f'running {len(exclusive_files)} exclusive test files one after another')
+        junit_files.append('results/junit/webui_test_exclusive.xml')
+        cucumber_files.append('results/cucumber/webui_test_exclusive.json')
+        worker_env = dict(os.environ, SATISFIED_DEPENDENCIES=','.join(passed_dependencies))
+        run(pytest_command(exclusive_files, junit_files[-1], cucumber_files[-1]), env=worker_env)
+
+    merge_junit_results(junit_files, 'results/junit/webui_test.xml', skipped_files)
+    merge_cucumber_results(cucumber_files, 'results/cucumber/webui_test.json')
+
+
+def run_selector_check():
+    # the stale selectors are reported before the run, without stopping it.
+    if not os.path.isdir(src_app):
+        print(f'skipping the selector check, {src_app} is not there')
+        return True
+    report = check_selectors([test_suite])
+    print_report(report)
+    return not report['stale']
 
 
 def run_testing():
@@ -138,19 +344,11 @@ def run_testing():
     os.environ['test_suite'] = test_suite
 
     convert_jira_feature_file(test_suite)
-    pytest_cmd = [
-        sys.executable,
-        '-m',
-        'pytest',
-        '-v',
-        test_suite,
-        "--junitxml=results/junit/webui_test.xml",
-        "--cucumber-json=results/cucumber/webui_test.json"
-    ]
-    if marker:
-        pytest_cmd.append("-k")
-        pytest_cmd.append(marker)
-    run(pytest_cmd)
+    run_selector_check()
+    if workers > 1:
+        run_workers(test_suite, workers)
+    else:
+        run(pytest_command([test_suite], 'results/junit/webui_test.xml', 'results/cucumber/webui_test.json'))
     openfile = open('results/cucumber/webui_test.json')
     data = json.load(openfile)
     for num in range(len(data)):
@@ -163,5 +361,7 @@ def run_testing():
 
 if run_convert is True:
     convert_jira_feature_file(test_suite)
+elif selectors_only is True:
+    exit(0 if run_selector_check() else 1)
 else:
     run_testing()
@@ -6,7 +6,6 @@ import xpaths
 from function import (
     wait_on_element,
     is_element_present,
-    wait_on_element_disappear,
     create_Pool
 )
 from pytest_bdd import (
@@ -48,8 +47,7 @@ def the_browser_is_open_the_truenas_url_and_logged_in(driver, nas_ip, root_passw
 def you_should_be_on_the_dashboard_click_storage_on_the_side_menu(driver):
     """you should be on the dashboard, click Storage on the side menu."""
     rsc.Verify_The_Dashboard(driver)
-    assert wait_on_element(driver, 10, xpaths.side_Menu.storage, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.storage).click()
+    rsc.Go_To(driver, 'storage')
 
 
 # TODO: when Bluefin is replaced by Cobia the steps below need to be refactor.
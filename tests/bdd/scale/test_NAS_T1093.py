@@ -48,10 +48,7 @@ def you_should_be_on_the_dashboard_click_on_the_accounts_on_the_side_menu_click_
     """you should be on the dashboard, click on the Accounts on the side menu, click on Users."""
     assert wait_on_element(driver, 10, xpaths.dashboard.title)
     assert wait_on_element(driver, 10, xpaths.dashboard.system_Info_Card_Title)
-    assert wait_on_element(driver, 10, xpaths.side_Menu.credentials, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.credentials).click()
-    assert wait_on_element(driver, 10, xpaths.side_Menu.local_User, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.local_User).click()
+    rsc.Go_To(driver, 'local_users')
 
 
 @then('The Users page should open')
@@ -51,8 +51,7 @@ def you_should_be_on_the_dashboard_click_storage_on_the_side_menu(driver):
     """you should be on the dashboard, click Storage on the side menu."""
     assert wait_on_element(driver, 10, xpaths.dashboard.title)
     assert wait_on_element(driver, 10, xpaths.dashboard.system_Info_Card_Title)
-    assert wait_on_element(driver, 10, xpaths.side_Menu.storage, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.storage).click()
+    rsc.Go_To(driver, 'storage')
 
 
 # TODO: when Bluefin is replaced by Cobia the steps below need to be refactor.
@@ -55,8 +55,7 @@ def on_the_dashboard_click_on_shares_on_the_left_sidebar(driver):
     """on the dashboard, click on Shares on the left sidebar."""
     assert wait_on_element(driver, 7, xpaths.dashboard.title)
     assert wait_on_element(driver, 10, xpaths.dashboard.system_Info_Card_Title)
-    assert wait_on_element(driver, 5, xpaths.side_Menu.shares, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.shares).click()
+    rsc.Go_To(driver, 'shares')
 
 
 @then('on the Sharing page, click the Add button on Windows (SMB) Shares')
@@ -185,9 +184,7 @@ def click_on_credentials_then_directory_services_and_disable_ad(driver):
 @then('click on network and click on Global Configuration')
 def click_on_network_and_click_on_global_configuration(driver):
     """click on network and click on Global Configuration."""
-    assert wait_on_element(driver, 10, xpaths.side_Menu.network, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.network).click()
-    assert wait_on_element(driver, 7, xpaths.network.title)
+    rsc.Go_To(driver, 'network')
     assert wait_on_element(driver, 5, xpaths.button.settings)
     driver.find_element_by_xpath(xpaths.button.settings).click()
     assert wait_on_element(driver, 10, xpaths.global_Configuration.title)
@@ -27,10 +27,7 @@ from pytest_dependency import depends
 @scenario('features/NAS-T1129.feature', 'Create an smb share with the LDAP dataset and verify the connection')
 def test_create_an_smb_share_with_the_ldap_dataset_and_verify_the_connection(driver):
     """Create an smb share with the LDAP dataset and verify the connection."""
-    assert wait_on_element(driver, 10, xpaths.side_Menu.credentials, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.credentials).click()
-    assert wait_on_element(driver, 10, xpaths.side_Menu.directory_Services, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.directory_Services).click()
+    rsc.Go_To(driver, 'directory_services')
     assert wait_on_element(driver, 7, xpaths.button.settings, 'clickable')
     driver.find_element_by_xpath(xpaths.button.settings).click()
     assert wait_on_element(driver, 7, xpaths.checkbox.enable, 'clickable')
@@ -70,8 +67,7 @@ def you_should_be_on_the_dashboard_click_on_shares_on_the_side_menu(driver):
     """you should be on the dashboard, click on Shares on the side menu."""
     assert wait_on_element(driver, 10, xpaths.dashboard.title)
     assert wait_on_element(driver, 10, xpaths.dashboard.system_Info_Card_Title)
-    assert wait_on_element(driver, 10, xpaths.side_Menu.shares, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.shares).click()
+    rsc.Go_To(driver, 'shares')
 
 
 @then('on the Shares page click on the SMB Add button')
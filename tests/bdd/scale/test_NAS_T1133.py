@@ -51,8 +51,7 @@ def you_should_be_on_the_dashboard_click_on_shares_on_the_side_menu(driver):
     """you should be on the dashboard, click on Shares on the side menu."""
     assert wait_on_element(driver, 10, xpaths.dashboard.title)
     assert wait_on_element(driver, 10, xpaths.dashboard.system_Info_Card_Title)
-    assert wait_on_element(driver, 10, xpaths.side_Menu.shares, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.shares).click()
+    rsc.Go_To(driver, 'shares')
 
 
 @then('on the Shares page click on the SMB Add button')
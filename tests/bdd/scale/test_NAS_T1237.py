@@ -52,8 +52,7 @@ def you_are_on_the_dashboard_click_on_datasets_in_the_side_menu(driver):
     """you are on the dashboard click on Datasets in the side menu."""
     assert wait_on_element(driver, 7, xpaths.dashboard.title)
     assert wait_on_element(driver, 5, xpaths.dashboard.system_Info_Card_Title)
-    assert wait_on_element(driver, 5, xpaths.side_Menu.datasets, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.datasets).click()
+    rsc.Go_To(driver, 'datasets')
 
 
 @then(parsers.parse('on the Datasets page create a SMB dataset {dataset1_name} with tank'))
@@ -184,9 +183,7 @@ def create_a_third_smb_dataset_rtacltest3(driver, dataset3_name, dataset1_name):
 @then(parsers.parse('create an SMB share with path {dataset1_path}'))
 def create_an_smb_share_with_path_mnttankrtacltest1share(driver, dataset1_path):
     """create an SMB share with path /mnt/tank/rt-acl-test-1/share."""
-    assert wait_on_element(driver, 10, xpaths.side_Menu.shares, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.shares).click()
-    assert wait_on_element(driver, 5, xpaths.sharing.title)
+    rsc.Go_To(driver, 'shares')
     assert wait_on_element(driver, 7, xpaths.sharing.smb_Add_Button, 'clickable')
     driver.find_element_by_xpath(xpaths.sharing.smb_Add_Button).click()
     assert wait_on_element(driver, 5, xpaths.smb.addTitle)
@@ -218,9 +215,7 @@ def create_an_smb_share_with_path_mnttankrtacltest1share(driver, dataset1_path):
 @then(parsers.parse('apply ACL to {dataset1_name} with recursive checked'))
 def apply_acl_to_rtacltest1_with_recusrive_checked(driver, dataset1_name):
     """apply ACL to rt-acl-test-1 with recursive checked."""
-    assert wait_on_element(driver, 10, xpaths.side_Menu.datasets, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.datasets).click()
-    assert wait_on_element(driver, 10, xpaths.dataset.title)
+    rsc.Go_To(driver, 'datasets')
     assert wait_on_element(driver, 5, xpaths.dataset.pool_Tree_Name('tank'))
     driver.find_element_by_xpath(xpaths.dataset.pool_Tree('tank')).click()
     assert wait_on_element(driver, 5, xpaths.dataset.dataset_Name(dataset1_name))
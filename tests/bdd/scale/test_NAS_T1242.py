@@ -7,7 +7,6 @@ import xpaths
 from function import (
     wait_on_element,
     is_element_present,
-    wait_on_element_disappear,
     create_Encrypted_Pool
 )
 from pytest_bdd import (
@@ -52,8 +51,7 @@ def on_the_dashboard_click_storage_on_the_side_menu(driver):
     assert wait_on_element(driver, 10, xpaths.side_Menu.dashboard, 'clickable')
     driver.find_element_by_xpath(xpaths.side_Menu.dashboard).click()
     assert wait_on_element(driver, 10, xpaths.dashboard.title)
-    assert wait_on_element(driver, 10, xpaths.side_Menu.storage, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.storage).click()
+    rsc.Go_To(driver, 'storage')
 
 
 # TODO: when Bluefin is replaced by Cobia the steps below need to be refactor.
@@ -47,8 +47,7 @@ def the_browser_is_open_the_truenas_url_and_logged_in(driver, nas_ip, root_passw
 def on_the_dashboard_click_datasets_on_the_side_menu(driver):
     """on the dashboard, click Datasets on the side menu."""
     rsc.Verify_The_Dashboard(driver)
-    assert wait_on_element(driver, 10, xpaths.side_Menu.datasets, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.datasets).click()
+    rsc.Go_To(driver, 'datasets')
 
 
 @then('on the Datasets page click on encrypted_pool')
@@ -46,10 +46,7 @@ def the_browser_is_open_navigate_to_the_scale_url_and_login(driver, nas_ip, root
 def on_the_dashboard_click_on_credentials_and_local_groups(driver):
     """on the dashboard click on Credentials and Local Groups."""
     rsc.Verify_The_Dashboard(driver)
-    assert wait_on_element(driver, 5, xpaths.side_Menu.credentials, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.credentials).click()
-    assert wait_on_element(driver, 5, xpaths.side_Menu.local_Group, 'clickable')
-    driver.find_element_by_xpath(xpaths.side_Menu.local_Group).click()
+    rsc.Go_To(driver, 'local_groups')
 
 
 @then('on the Groups page click to expand the gidtestdupe entry')
@@ -18,6 +18,8 @@ from pytest_bdd import (
     when
 )
 from pytest_dependency import depends
+import pytest
+pytestmark = [pytest.mark.exclusive]
 
 
 @scenario('features/NAS-T1257.feature', 'Verify the ssh host key stay the same after reboot')
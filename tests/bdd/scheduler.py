@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import ast
+import os
+import re
+from functools import lru_cache
+
+
+def is_setup_test(test_file):
+    # the numbered tests like test_001_NAS_T1665.py setup the NAS for the
+    # rest of the suite and need to run in order before anything else.
+    return re.match(r'test_\d+_', os.path.basename(test_file)) is not None
+
+
+def list_test_files(directory):
+    return sorted(
+        f'{directory}/{test_file}' for test_file in os.listdir(directory)
+        if test_file.startswith('test_') and test_file.endswith('.py')
+    )
+
+
+def _string_values(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return [value for element in node.elts for value in _string_values(element)]
+    return []
+
+
+@lru_cache(maxsize=None)
+def scan_dependencies(test_file):
+    """
+    Return the dependency names a test file provides with
+    @pytest.mark.dependency(name=...) and the one it needs with depends(),
+    exclusive is True for a test file marked with pytest.mark.exclusive.
+    """
+    with open(test_file, 'r') as source:
+        tree = ast.parse(source.read(), filename=str(test_file))
+    provides = set()
+    needs = set()
+    exclusive = False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Attribute) and node.attr == 'exclusive':
+            exclusive = exclusive or (isinstance(node.value, ast.Attribute) and node.value.attr == 'mark')
+        if not isinstance(node, ast.Call):
+            continue
+        function = node.func
+        function_name = function.attr if isinstance(function, ast.Attribute) else getattr(function, 'id', None)
+        if function_name == 'dependency':
+            for keyword in node.keywords:
+                if keyword.arg == 'name':
+                    provides.update(_string_values(keyword.value))
+                elif keyword.arg == 'depends':
+                    needs.update(_string_values(keyword.value))
+        elif function_name == 'depends' and len(node.args) > 1:
+            needs.update(_string_values(node.args[1]))
+    return {'provides': provides, 'needs': needs - provides, 'exclusive': exclusive}
+
+
+def dependency_graph(test_files):
+    """
+    Return {test_file: set of test files it depends on} for test_files,
+    names provided outside of test_files are ignored.
+    """
+    dependencies = {test_file: scan_dependencies(test_file) for test_file in test_files}
+    providers = {}
+    for test_file, names in dependencies.items():
+        for name in names['provides']:
+            providers.setdefault(name, set()).add(test_file)
+    graph = {}
+    for test_file, names in dependencies.items():
+        graph[test_file] = set()
+        for name in names['needs']:
+            graph[test_file] |= providers.get(name, set())
+    return graph
+
+
+def topological_order(graph):
+    # keep the filename order unless a dependency needs to run first.
+    ordered = []
+    remaining = {test_file: set(parents) for test_file, parents in graph.items()}
+    while remaining:
+        ready = [test_file for test_file, parents in remaining.items() if not parents & remaining.keys()]
+        # on a dependency cycle keep the filename order for what is left.
+        test_file = min(ready or remaining)
+        ordered.append(test_file)
+        del remaining[test_file]
+    return ordered
+
+
+def descendants(graph, test_files):
+    found = set()
+    pending = set(test_files)
+    while pending:
+        children = {child for child, parents in graph.items() if parents & pending} - found
+        found |= children
+        pending = children
+    return found
+
+
+def dependency_chains(graph):
+    """
+    Split the graph into independent chains, test files sharing any
+    ancestor end up in the same chain in topological order.
+    """
+    chains = []
+    for test_file in topological_order(graph):
+        linked = [chain for chain in chains if graph[test_file] & set(chain)]
+        chain = [test_file]
+        for other in linked:
+            chain = other + chain
+            chains.remove(other)
+        chains.append(chain)
+    return [[test_file for test_file in topological_order(graph) if test_file in chain] for chain in chains]
+
+
+def schedule_chains(chains, worker_count):
+    """
+    Give each chain to a single worker, the longest chains are placed first
+    on the least loaded worker.
+    """
+    workers = [[] for _ in range(worker_count)]
+    for chain in sorted(chains, key=len, reverse=True):
+        min(workers, key=lambda worker: sum(len(c) for c in worker)).append(chain)
+    return [[test_file for chain in worker for test_file in chain] for worker in workers if worker]
+
+
+def schedule_workers(chains, worker_count):
+    """
+    Return the test files of each worker and the exclusive test files.
+    A chain with an exclusive test, like a failover, a reboot or a degraded
+    pool on the NAS all the workers share, is kept out of the workers to
+    run alone after them, the exclusive chains one after another.
+    """
+    exclusive = [chain for chain in chains if any(scan_dependencies(test_file)['exclusive'] for test_file in chain)]
+    parallel = [chain for chain in chains if chain not in exclusive]
+    return schedule_chains(parallel, worker_count), [test_file for chain in exclusive for test_file in chain]
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import os
+import re
+from functools import lru_cache
+
+# the XPath tokens the compiler knows, anything else is left to the XPath
+TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<axis>//|/)
+      | (?P<string>"[^"]*"|'[^']*')
+      | (?P<function>contains|starts-with|not)\s*\(
+      | (?P<attribute>@[A-Za-z_][\w-]*)
+      | (?P<name>\*|[a-z][a-z0-9-]*)
+      | (?P<symbol>[\[\](),=])
+    )
+''', re.VERBOSE)
+
+
+class Unsupported(Exception):
+    pass
+
+
+def tokenize(xpath):
+    tokens, position = [], 0
+    xpath = xpath.strip()
+    while position < len(xpath):
+        match = TOKEN.match(xpath, position)
+        if match is None or match.end() == position:
+            raise Unsupported(xpath[position:])
+        kind = match.lastgroup
+        value = match.group(kind)
+        # "and" is lowercase in XPath, a name token elsewhere
+        if kind == 'name' and value == 'and':
+            kind = 'and'
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+def css_string(value):
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\a ')
+    return f'"{escaped}"'
+
+
+class Compiler:
+    """
+    Translate an XPath made of element names and attribute conditions like
+    //ix-input[@formcontrolname="name"]//input into a CSS selector.
+    """
+
+    def __init__(self, xpath):
+        self.tokens = tokenize(xpath)
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self, kind, value=None):
+        token_kind, token_value = self.peek()
+        if token_kind != kind or (value is not None and token_value != value):
+            raise Unsupported(f'{kind} {value or ""} expected at {token_value}')
+        self.position += 1
+        return token_value
+
+    def compile(self):
+        # only the steps from the document root //, an XPath starting with
+        # / or ( does not have the same meaning in CSS
+        if self.peek() != ('axis', '//'):
+            raise Unsupported('the XPath does not start with //')
+        self.take('axis')
+        css = self.step()
+        while self.peek()[0] == 'axis':
+            css += ' ' if self.take('axis') == '//' else ' > '
+            css += self.step()
+        if self.position != len(self.tokens):
+            raise Unsupported(self.peek()[1])
+        return css
+
+    def step(self):
+        name = self.take('name')
+        css = '' if name == '*' else name
+        while self.peek() == ('symbol', '['):
+            self.take('symbol', '[')
+            css += self.condition()
+            while self.peek()[0] == 'and':
+                self.take('and')
+                css += self.condition()
+            self.take('symbol', ']')
+        return css or '*'
+
+    def condition(self):
+        kind, value = self.peek()
+        if kind == 'attribute':
+            attribute = self.take('attribute')[1:]
+            if self.peek() != ('symbol', '='):
+                return f'[{attribute}]'
+            self.take('symbol', '=')
+            return f'[{attribute}={css_string(self.take("string")[1:-1])}]'
+        if kind == 'function' and value == 'not':
+            self.take('function')
+            css = self.condition()
+            self.take('symbol', ')')
+            return f':not({css})'
+        if kind == 'function':
+            self.take('function')
+            attribute = self.take('attribute')[1:]
+            self.take('symbol', ',')
+            text = self.take('string')[1:-1]
+            self.take('symbol', ')')
+            # an empty text matches every element in XPath but none in CSS
+            if not text:
+                raise Unsupported(f'{value} with an empty text')
+            return f'[{attribute}{"*=" if value == "contains" else "^="}{css_string(text)}]'
+        raise Unsupported(value)
+
+
+@lru_cache(maxsize=None)
+def xpath_to_css(xpath):
+    """
+    Return the CSS selector matching the same elements as xpath in the same
+    order, or None when xpath tests text, positions or other axes.
+    """
+    try:
+        return Compiler(xpath).compile()
+    except Unsupported:
+        return None
+
+
+def css_for(xpath):
+    """
+    The CSS selector used by the wait helpers in place of xpath, none with
+    SELECTOR_ENGINE=xpath.
+    """
+    if os.environ.get('SELECTOR_ENGINE') == 'xpath':
+        return None
+    return xpath_to_css(xpath)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+
+import ast
+import hashlib
+import inspect
+import json
+import os
+import re
+import sys
+from html.parser import HTMLParser
+
+src_app = os.path.abspath(f'{os.path.dirname(__file__)}/../../src/app')
+
+# element types added in front of the ixTest description, like in
+# getElementType() of src/app/modules/test-id/test/test.directive.ts
+element_types = {
+    'tr': 'row',
+    'mat-slide-toggle': 'toggle',
+    'input': 'input',
+    'button': 'button',
+    'select': 'select',
+    'textarea': 'textarea',
+    'table': 'table',
+    'a': 'link',
+    'ix-icon': 'icon',
+    'div': 'text',
+    'p': 'text',
+    'span': 'text'
+}
+for tag in ['mat-checkbox', 'mat-option', 'mat-select', 'mat-radio-group', 'mat-radio-button', 'mat-icon', 'mat-row',
+            'mat-slider', 'mat-button-toggle-group', 'mat-button-toggle']:
+    element_types[tag] = tag.replace('mat-', '')
+
+# stand-ins in the patterns, replaced by regular expressions once all
+# templates are read
+ANY = '\x00any\x00'
+FORM_CONTROL = '\x00form\x00'
+
+
+def kebab_case(text):
+    """
+    Like lodash kebabCase used by the ixTest directive.
+    """
+    words = re.findall(r'[A-Z]{2,}(?=[A-Z][a-z]+|\d|\b|_)|[A-Z]?[a-z]+|[A-Z]+|\d+', str(text))
+    return '-'.join(word.lower() for word in words)
+
+
+def split_expression(expression):
+    """
+    Split the items of an Angular array literal like "['a', item.name]".
+    """
+    expression = expression.strip()
+    if not (expression.startswith('[') and expression.endswith(']')):
+        return [expression]
+    items, depth, current, quote = [], 0, '', None
+    for char in expression[1:-1]:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in '\'"':
+            quote = char
+        elif char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            items.append(current.strip())
+            current = ''
+            continue
+        current += char
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+
+def description_parts(value, bound):
+    if not bound:
+        return [kebab_case(value)]
+    parts = []
+    for item in split_expression(value):
+        literal = re.fullmatch(r'''(['"])(.*)\1''', item)
+        if literal:
+            parts.append(kebab_case(literal.group(2)))
+        elif item in ('controlDirective.name', 'formControlName', 'controlName'):
+            parts.append(FORM_CONTROL)
+        else:
+            parts.append(ANY)
+    return parts
+
+
+class TemplateParser(HTMLParser):
+    def __init__(self, index):
+        super().__init__(convert_charrefs=True)
+        self.index = index
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        if tag.startswith('ix-'):
+            self.index['elements'].add(tag)
+        if 'formcontrolname' in attributes:
+            self.index['form_controls'].add(attributes['formcontrolname'])
+        for name, bound in (('ixtest', False), ('[ixtest]', True), ('ixtestoverride', False), ('[ixtestoverride]', True)):
+            if name not in attributes or attributes[name] is None:
+                continue
+            parts = description_parts(attributes[name], bound)
+            if 'override' in name:
+                # the override replaces the description of the ixTest nested
+                # in the component, its element type is not known here
+                self.index['data_test'].add((ANY, *parts))
+            elif tag in element_types:
+                self.index['data_test'].add((element_types[tag], *parts))
+
+    handle_startendtag = handle_starttag
+
+
+def template_files(src):
+    for root, _, files in os.walk(src):
+        for name in files:
+            if name.endswith('.html') or (name.endswith('.ts') and not name.endswith('.spec.ts')):
+                yield os.path.join(root, name)
+
+
+def fingerprint(files):
+    digest = hashlib.sha1()
+    for path in sorted(files):
+        stat = os.stat(path)
+        digest.update(f'{path}:{stat.st_mtime_ns}:{stat.st_size}'.encode())
+    return digest.hexdigest()
+
+
+def build_index(src=src_app, cache='results/selector_index.json'):
+    """
+    Return the data-test patterns, formcontrolname values and ix-* element
+    names found in the templates under src, cached until a file changes.
+    """
+    files = list(template_files(src))
+    key = fingerprint(files)
+    if cache and os.path.exists(cache):
+        with open(cache) as cache_file:
+            cached = json.load(cache_file)
+        if cached.get('fingerprint') == key:
+            return {
+                'data_test': {tuple(pattern) for pattern in cached['data_test']},
+                'form_controls': set(cached['form_controls']),
+                'elements': set(cached['elements'])
+            }
+    index = {'data_test': set(), 'form_controls': set(), 'elements': set()}
+    parser = TemplateParser(index)
+    for path in files:
+        with open(path, encoding='utf-8') as source:
+            text = source.read()
+        if path.endswith('.ts'):
+            for selector in re.findall(r'''selector:\s*['"]([^'"]+)['"]''', text):
+                index['elements'].update(re.findall(r'(?:^|,)\s*(ix-[a-z0-9-]+)', selector))
+            # inline templates of the components
+            for template in re.findall(r'template:\s*`([^`]*)`', text):
+                parser.feed(template)
+        else:
+            parser.feed(text)
+        parser.close()
+        parser.reset()
+    if cache:
+        os.makedirs(os.path.dirname(cache) or '.', exist_ok=True)
+        with open(cache, 'w') as cache_file:
+            json.dump({
+                'fingerprint': key,
+                'data_test': sorted(index['data_test']),
+                'form_controls': sorted(index['form_controls']),
+                'elements': sorted(index['elements'])
+            }, cache_file)
+    return index
+
+
+def pattern_regex(parts, form_controls):
+    form = '|'.join(sorted((re.escape(kebab_case(name)) for name in form_controls), key=len, reverse=True))
+    regex = ''
+    for position, part in enumerate(parts):
+        separator = '-' if position else ''
+        if part == ANY:
+            # an empty part is filtered out with its separator
+            regex += f'(?:{separator}.+)?'
+        elif part == FORM_CONTROL:
+            # an unnamed control has no description
+            regex += f'(?:{separator}(?:{form}))?'
+        elif part:
+            regex += f'{separator}{re.escape(part)}'
+    return re.compile(regex)
+
+
+class SelectorIndex:
+    def __init__(self, index):
+        self.index = index
+        self.data_test = [
+            (
+                pattern_regex(parts, index['form_controls']),
+                '-'.join('x' if part in (ANY, FORM_CONTROL) else part for part in parts if part)
+            )
+            for parts in index['data_test']
+        ]
+        self.form_controls = index['form_controls']
+        self.elements = index['elements']
+        self.cache = {}
+
+    def data_test_status(self, value):
+        """
+        Return 'ok', 'unverified' when only a weak pattern matches or
+        'stale', value can have {placeholders} from the f-strings and the
+        selector functions that stand for any text.
+        """
+        if value not in self.cache:
+            sample = re.sub(r'\{[^}]*\}', 'x', value)
+            value_regex = re.compile(re.sub(r'\\\{[^}]*\\\}', '.+', re.escape(value)))
+            # a pattern bound to a runtime value, like [ixTest]="[row.name]",
+            # matches any text, it is weak when it takes the value with junk
+            # added too
+            matches = [
+                bool(pattern.fullmatch(f'{sample}-\x01'))
+                for pattern, pattern_sample in self.data_test
+                if pattern.fullmatch(sample) or value_regex.fullmatch(pattern_sample)
+            ]
+            self.cache[value] = 'stale' if not matches else 'unverified' if all(matches) else 'ok'
+        return self.cache[value]
+
+    def has_form_control(self, value):
+        return '{' in value or value in self.form_controls
+
+    def has_element(self, value):
+        return value in self.elements
+
+    def check(self, xpath):
+        """
+        Return {'stale', 'unverified'} lists of the parts of xpath that no
+        template can render or that only a runtime value could.
+        """
+        results = {'stale': [], 'unverified': []}
+        for value in re.findall(r'@data-test\s*=\s*["\']([^"\']*)["\']', xpath):
+            status = self.data_test_status(value)
+            if status != 'ok':
+                results[status].append(f'data-test="{value}"')
+        for value in re.findall(r'@formcontrolname\s*=\s*["\']([^"\']*)["\']', xpath):
+            if not self.has_form_control(value):
+                results['stale'].append(f'formcontrolname="{value}"')
+        for value in re.findall(r'(?:^|[/:(\[|])(ix-[a-z0-9-]+)(?=[\[/)\]|]|$)', xpath):
+            if not self.has_element(value):
+                results['stale'].append(f'<{value}>')
+        return results
+
+
+def xpaths_selectors(module):
+    """
+    Yield (location, xpath) for the selectors of xpaths.py, the selector
+    functions are called with {parameter} for each of their arguments.
+    """
+    for class_name, cls in vars(module).items():
+        if not inspect.isclass(cls) or cls.__module__ != module.__name__:
+            continue
+        for name, value in vars(cls).items():
+            if isinstance(value, str) and '/' in value:
+                yield f'xpaths.{class_name}.{name}', value
+            elif inspect.isfunction(value):
+                parameters = inspect.signature(value).parameters
+                try:
+                    xpath = value(*(f'{{{parameter}}}' for parameter in parameters))
+                except Exception:
+                    continue
+                if isinstance(xpath, str):
+                    yield f'xpaths.{class_name}.{name}', xpath
+
+
+def string_value(node):
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.JoinedStr):
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append(str(value.value))
+            else:
+                parts.append('{' + ast.unparse(value.value) + '}')
+        return ''.join(parts)
+    return None
+
+
+def inline_selectors(path):
+    """
+    Yield (location, xpath) for the XPath string literals of a Python file.
+    """
+    with open(path, encoding='utf-8') as source:
+        tree = ast.parse(source.read(), path)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.JoinedStr) or (isinstance(node, ast.Constant) and isinstance(node.value, str)):
+            value = string_value(node)
+            if value and value.lstrip('(').startswith('//'):
+                yield f'{path}:{node.lineno}', value
+
+
+def validate(index, selectors):
+    report = {'checked': len(selectors), 'stale': [], 'unverified': []}
+    for location, xpath in selectors:
+        results = index.check(xpath)
+        for status in ('stale', 'unverified'):
+            if results[status]:
+                report[status].append({'location': location, 'xpath': xpath, 'selectors': results[status]})
+    return report
+
+
+def check_selectors(directories, src=src_app, report_file='results/stale_selectors.json'):
+    """
+    Validate xpaths.py and the inline XPaths of the Python files in
+    directories against the templates, write and return the report.
+    """
+    import xpaths
+    index = SelectorIndex(build_index(src))
+    selectors = list(xpaths_selectors(xpaths))
+    # the shared steps have inline XPaths too
+    python_files = [f'{os.path.dirname(os.path.abspath(__file__))}/reusableSeleniumCode.py']
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            python_files += [os.path.join(root, name) for name in sorted(files) if name.endswith('.py')]
+    for path in python_files:
+        selectors += list(inline_selectors(path))
+    report = validate(index, selectors)
+    os.makedirs(os.path.dirname(report_file) or '.', exist_ok=True)
+    with open(report_file, 'w') as outfile:
+        json.dump(report, outfile, indent=2)
+    return report
+
+
+def print_report(report):
+    for stale in report['stale']:
+        print(f"{stale['location']}: {', '.join(stale['selectors'])}\n    {stale['xpath']}")
+    print(f"{len(report['stale'])} stale and {len(report['unverified'])} unverified selectors out of {report['checked']}")
+
+
+if __name__ == '__main__':
+    report = check_selectors(sys.argv[1:] or ['ha-bhyve02', 'ha-tn09', 'scale'])
+    print_report(report)
+    sys.exit(1 if report['stale'] else 0)
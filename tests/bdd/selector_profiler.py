@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import sys
+from dom_snapshot import load_snapshot, snapshot_files
+from selector_compiler import xpath_to_css
+
+# time repeat lookups of each selector, with the XPath like the wait
+# helpers evaluate it and with its compiled CSS selector when there is one
+PROFILE_SCRIPT = """
+var selectors = arguments[0], repeat = arguments[1], results = [];
+
+function measure(find) {
+    var start = performance.now(), element = find();
+    for (var index = 1; index < repeat; index++) {
+        find();
+    }
+    return {ms: (performance.now() - start) / repeat, found: element !== null};
+}
+
+selectors.forEach(function (selector) {
+    var result = {name: selector[0]};
+    try {
+        var xpath = measure(function () {
+            return document.evaluate(selector[1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        });
+        result.xpath_ms = xpath.ms;
+        result.found = xpath.found;
+        if (selector[2]) {
+            var css = measure(function () {
+                return document.querySelector(selector[2]);
+            });
+            result.css_ms = css.ms;
+            result.css_found = css.found;
+        }
+    } catch (error) {
+        result.error = String(error);
+    }
+    results.push(result);
+});
+return results;
+"""
+
+
+def profile_selectors(driver, snapshots, selectors, repeat=10, chunk=50):
+    """
+    Evaluate every (name, xpath) of selectors on each snapshot and return
+    the selectors ranked from the slowest mean XPath time.
+    """
+    entries = {
+        name: {
+            'name': name,
+            'xpath': xpath,
+            'css': xpath_to_css(xpath),
+            'pages': {},
+            'found_on': [],
+            'css_mismatch_on': [],
+            'errors': []
+        }
+        for name, xpath in selectors
+    }
+    items = [[name, entry['xpath'], entry['css']] for name, entry in entries.items()]
+    for path in snapshots:
+        load_snapshot(driver, path)
+        # a single script for all the selectors can go over the script timeout
+        for index in range(0, len(items), chunk):
+            for result in driver.execute_script(PROFILE_SCRIPT, items[index:index + chunk], repeat):
+                entry = entries[result['name']]
+                if 'error' in result:
+                    entry['errors'].append(f"{path}: {result['error']}")
+                    continue
+                entry['pages'][path] = {'xpath_ms': result['xpath_ms'], 'css_ms': result.get('css_ms')}
+                if result['found']:
+                    entry['found_on'].append(path)
+                if entry['css'] and result['css_found'] != result['found']:
+                    entry['css_mismatch_on'].append(path)
+    for entry in entries.values():
+        xpath_times = [times['xpath_ms'] for times in entry['pages'].values()]
+        css_times = [times['css_ms'] for times in entry['pages'].values() if times['css_ms'] is not None]
+        entry['mean_ms'] = round(sum(xpath_times) / len(xpath_times), 4) if xpath_times else None
+        entry['max_ms'] = round(max(xpath_times), 4) if xpath_times else None
+        entry['css_mean_ms'] = round(sum(css_times) / len(css_times), 4) if css_times else None
+    return sorted(entries.values(), key=lambda entry: entry['mean_ms'] or 0, reverse=True)
+
+
+def save_profile(ranking, results_file='results/selector_profile.json'):
+    os.makedirs(os.path.dirname(results_file), exist_ok=True)
+    with open(results_file, 'w') as outfile:
+        json.dump(ranking, outfile, indent=2)
+
+
+def profile_summary(ranking, top=25):
+    lines = [f"{'mean ms':>9} {'max ms':>9} {'css ms':>9}  selector"]
+    for entry in ranking[:top]:
+        css = f"{entry['css_mean_ms']:9.4f}" if entry['css_mean_ms'] is not None else f"{'-':>9}"
+        lines.append(f"{entry['mean_ms'] or 0:9.4f} {entry['max_ms'] or 0:9.4f} {css}  {entry['name']}")
+    compiled = [entry for entry in ranking if entry['css']]
+    lines.append(f'{len(compiled)} of {len(ranking)} selectors compile to CSS')
+    for entry in ranking:
+        if entry['css_mismatch_on']:
+            lines.append(f"CSS does not match like the XPath: {entry['name']} on {', '.join(entry['css_mismatch_on'])}")
+    return lines
+
+
+if __name__ == '__main__':
+    import xpaths
+    from conftest import browser
+    from selector_index import xpaths_selectors
+    snapshots = snapshot_files(*sys.argv[1:2])
+    if not snapshots:
+        print('no DOM snapshots to profile the selectors on, save them with dom_snapshot.save_snapshot()')
+        sys.exit(1)
+    web_driver = browser()
+    ranking = profile_selectors(web_driver, snapshots, list(xpaths_selectors(xpaths)))
+    save_profile(ranking)
+    print('\n'.join(profile_summary(ranking)))
+    web_driver.quit()
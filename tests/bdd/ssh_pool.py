@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+import atexit
+import os
+import re
+import shutil
+import tempfile
+from subprocess import run, DEVNULL, PIPE, TimeoutExpired
+from uuid import uuid4
+
+ssh_options = [
+    "-o",
+    "StrictHostKeyChecking=no",
+    "-o",
+    "UserKnownHostsFile=/dev/null",
+    "-o",
+    "VerifyHostKeyDNS=no",
+    "-o",
+    "LogLevel=ERROR"
+]
+
+
+def _results(returncode, output, stderr):
+    return {'result': returncode == 0, 'output': output, 'stderr': stderr}
+
+
+class SSHPool:
+    """
+    One persistent OpenSSH master connection per (user, host), the commands
+    go through it without a new handshake or password.
+    """
+
+    def __init__(self, control_persist=600):
+        self.control_dir = None
+        self.control_persist = control_persist
+
+    def control_path(self, username, host):
+        if self.control_dir is None:
+            self.control_dir = tempfile.mkdtemp(prefix='uitest-ssh-')
+        return f'{self.control_dir}/{username}@{host}'
+
+    def options(self, username, host):
+        return ssh_options + ["-o", f"ControlPath={self.control_path(username, host)}", "-o", "ControlMaster=no"]
+
+    def is_connected(self, username, host):
+        if not os.path.exists(self.control_path(username, host)):
+            return False
+        check = run(['ssh', *self.options(username, host), '-O', 'check', f'{username}@{host}'],
+                    stdout=DEVNULL, stderr=DEVNULL, timeout=5)
+        return check.returncode == 0
+
+    def connect(self, username, password, host, timeout=10):
+        if self.is_connected(username, host):
+            return True
+        self.disconnect(username, host)
+        cmd = [] if password is None else ["sshpass", "-p", password]
+        cmd += [
+            "ssh",
+            *ssh_options,
+            "-o", f"ControlPath={self.control_path(username, host)}",
+            "-o", "ControlMaster=yes",
+            "-o", f"ControlPersist={self.control_persist}",
+            # notice a dead controller instead of hanging on it
+            "-o", "ServerAliveInterval=5",
+            "-o", "ServerAliveCountMax=3",
+            "-N",
+            "-f",
+            f"{username}@{host}"
+        ]
+        try:
+            return run(cmd, stdin=DEVNULL, stdout=DEVNULL, stderr=DEVNULL, timeout=timeout).returncode == 0
+        except TimeoutExpired:
+            return False
+
+    def disconnect(self, username, host):
+        control_path = self.control_path(username, host)
+        if os.path.exists(control_path):
+            try:
+                run(['ssh', *self.options(username, host), '-O', 'exit', f'{username}@{host}'],
+                    stdout=DEVNULL, stderr=DEVNULL, timeout=5)
+            except TimeoutExpired:
+                pass
+            if os.path.exists(control_path):
+                os.remove(control_path)
+
+    def reset(self):
+        """
+        Drop every connection, the next commands reconnect to whatever
+        controller answers on the host like after a failover.
+        """
+        if self.control_dir is not None:
+            for name in os.listdir(self.control_dir):
+                username, _, host = name.partition('@')
+                self.disconnect(username, host)
+
+    def close(self):
+        self.reset()
+        if self.control_dir is not None:
+            shutil.rmtree(self.control_dir, ignore_errors=True)
+            self.control_dir = None
+
+    def _ssh(self, command, username, host, timeout):
+        cmd = ['ssh', *self.options(username, host), '-o', 'BatchMode=yes', f'{username}@{host}', command]
+        return run(cmd, stdout=PIPE, stderr=PIPE, universal_newlines=True, timeout=timeout)
+
+    def _direct(self, command, username, password, host, timeout):
+        cmd = [] if password is None else ["sshpass", "-p", password]
+        cmd += ["ssh", *ssh_options, f"{username}@{host}", command]
+        return run(cmd, stdout=PIPE, stderr=PIPE, universal_newlines=True, timeout=timeout)
+
+    def _process(self, command, username, password, host, timeout):
+        for attempt in range(2):
+            if not self.connect(username, password, host, max(timeout, 10)):
+                break
+            process = self._ssh(command, username, host, timeout)
+            # 255 is an ssh error, reconnect if the master connection is gone
+            if process.returncode != 255 or self.is_connected(username, host):
+                return process
+            self.disconnect(username, host)
+        return self._direct(command, username, password, host, timeout)
+
+    def run(self, command, username, password, host, timeout=5):
+        try:
+            process = self._process(command, username, password, host, timeout)
+        except TimeoutExpired:
+            # the master may hang on a controller that went away
+            self.disconnect(username, host)
+            return _results(1, 'Timeout', 'Timeout')
+        return _results(process.returncode, process.stdout, process.stderr)
+
+    def run_batch(self, commands, username, password, host, timeout=30):
+        """
+        Run commands in a single ssh call and return the results of each
+        command in order, every command runs in its own subshell.
+        """
+        token = uuid4().hex
+        marker = f'__uitest_{token}__'
+        script = '\n'.join(f'({command})\necho {marker} $?\necho {marker} >&2' for command in commands)
+        try:
+            process = self._process(script, username, password, host, timeout)
+        except TimeoutExpired:
+            self.disconnect(username, host)
+            return [_results(1, 'Timeout', 'Timeout') for _ in commands]
+        outputs = re.split(f'{marker} (\\d+)\n', process.stdout)
+        errors = process.stderr.split(f'{marker}\n')
+        results = []
+        for index in range(len(commands)):
+            if 2 * index + 1 < len(outputs):
+                results.append(_results(int(outputs[2 * index + 1]), outputs[2 * index], errors[index]))
+            elif 2 * index == len(outputs) - 1:
+                # the batch stopped in this command like on a lost connection
+                results.append(_results(1, outputs[-1], errors[-1]))
+            else:
+                results.append(_results(1, '', 'Not run'))
+        return results
+
+
+ssh_pool = SSHPool()
+atexit.register(ssh_pool.close)
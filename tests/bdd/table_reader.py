@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+# Serialize a rendered <table> (ix-table, mat-table) or ngx-datatable in one
+# call: the header texts, the cell texts of each row, the row element and
+# its buttons. With arguments[1] true the table scroll container is only
+# moved down one page, for the virtual scroll of the large tables.
+TABLE_SCRIPT = """
+const root = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!root) { return null; }
+const text = (element) => (element.innerText || element.textContent || '').trim();
+let scroller = root.querySelector('cdk-virtual-scroll-viewport, datatable-body');
+for (let element = root; !scroller && element; element = element.parentElement) {
+  const overflow = getComputedStyle(element).overflowY;
+  if ((overflow === 'auto' || overflow === 'scroll') && element.scrollHeight > element.clientHeight) {
+    scroller = element;
+  }
+}
+scroller = scroller || document.scrollingElement;
+if (arguments[1]) {
+  scroller.scrollTop += scroller.clientHeight;
+  return {scrolled: true};
+}
+const datatable = root.matches('ngx-datatable') ? root : root.querySelector('ngx-datatable');
+let headers, rows;
+if (datatable) {
+  headers = Array.from(datatable.querySelectorAll('datatable-header-cell')).map(text);
+  rows = Array.from(datatable.querySelectorAll('datatable-body-row')).map((row) => ({
+    row: row, cells: Array.from(row.querySelectorAll('datatable-body-cell'))
+  }));
+} else {
+  const table = root.matches('table') ? root : root.querySelector('table');
+  if (!table) { return null; }
+  headers = Array.from(table.querySelectorAll('thead th')).map(text);
+  rows = Array.from(table.querySelectorAll('tbody tr')).map((row) => ({
+    row: row, cells: Array.from(row.children).filter((cell) => cell.matches('td'))
+  }));
+}
+return {
+  headers: headers,
+  rows: rows.map((item) => ({
+    cells: item.cells.map(text),
+    element: item.row,
+    test_id: item.row.getAttribute('data-test'),
+    actions: Array.from(item.row.querySelectorAll('button, a, ix-icon[role="button"], mat-icon'))
+  })),
+  at_end: scroller.scrollTop + scroller.clientHeight >= scroller.scrollHeight - 1
+};
+"""
+
+# the scroll moves before the read, give the virtual scroll time to render
+SCROLL_SETTLE = """
+const done = arguments[arguments.length - 1];
+requestAnimationFrame(() => requestAnimationFrame(() => done(true)));
+"""
+
+
+class Row:
+    """
+    A table row, the cells are read by header name or by position.
+    """
+
+    def __init__(self, headers, cells, element=None, test_id=None, actions=()):
+        self.headers = headers
+        self.cells = cells
+        self.element = element
+        self.test_id = test_id
+        self.actions = list(actions)
+        # an expanded row is followed by a detail row with a single cell
+        self.detail = None
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self.cells[key]
+        return self.cells[self.headers.index(key)]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except (IndexError, ValueError):
+            return default
+
+    def contains(self, text):
+        return any(text in cell for cell in self.cells)
+
+    def action(self, text):
+        """
+        Return the first button of the row with text in its label.
+        """
+        for action in self.actions:
+            if text in (action.text or '') or text in (action.get_attribute('aria-label') or ''):
+                return action
+        return None
+
+    def __repr__(self):
+        return f'Row({self.cells})'
+
+
+class Table:
+    """
+    Rows of a table read with TABLE_SCRIPT, more pages of a virtual scroll
+    table are only read when a lookup does not find its row.
+    """
+
+    def __init__(self, driver, xpath, max_pages=50):
+        self.driver = driver
+        self.xpath = xpath
+        self.max_pages = max_pages
+        self.headers = []
+        self.rows = []
+        self.seen = set()
+        self.indexes = {}
+        self.at_end = False
+        self.pages = 0
+
+    def _read(self, scroll):
+        if scroll:
+            self.driver.execute_script(TABLE_SCRIPT, self.xpath, True)
+            self.driver.execute_async_script(SCROLL_SETTLE)
+        data = self.driver.execute_script(TABLE_SCRIPT, self.xpath, False)
+        self.pages += 1
+        if data is None:
+            self.at_end = True
+            return []
+        self.headers = data['headers'] or self.headers
+        new_rows = []
+        for item in data['rows']:
+            previous = new_rows or self.rows
+            if len(item['cells']) <= 1 and len(self.headers) > 1 and previous:
+                previous[-1].detail = item['cells'][0] if item['cells'] else ''
+                continue
+            key = (item['test_id'], tuple(item['cells']))
+            # the rows still rendered from the page before come again
+            if key in self.seen:
+                continue
+            self.seen.add(key)
+            new_rows.append(Row(self.headers, item['cells'], item['element'], item['test_id'], item['actions']))
+        self.rows += new_rows
+        self.at_end = data['at_end'] or (scroll and not new_rows) or self.pages >= self.max_pages
+        for column, index in self.indexes.items():
+            for row in new_rows:
+                index.setdefault(row.get(column), row)
+        return new_rows
+
+    def load(self):
+        self._read(False)
+        return self
+
+    def more(self):
+        """
+        Scroll to the next page and return its new rows, [] at the end.
+        """
+        if self.at_end:
+            return []
+        return self._read(True)
+
+    def load_all(self):
+        while self.more():
+            pass
+        return self.rows
+
+    def index(self, column):
+        """
+        Return {cell text of column: row} of the rows read so far.
+        """
+        if column not in self.indexes:
+            self.indexes[column] = {}
+            for row in self.rows:
+                self.indexes[column].setdefault(row.get(column), row)
+        return self.indexes[column]
+
+    def row(self, column, value):
+        """
+        Return the row with value in column, reading more pages until it is
+        found, or None.
+        """
+        index = self.index(column)
+        while value not in index and self.more():
+            pass
+        return index.get(value)
+
+    def find(self, predicate):
+        """
+        Return the rows read so far where predicate(row) is true.
+        """
+        return [row for row in self.rows if predicate(row)]
+
+
+def read_table(driver, xpath='//table', max_pages=50):
+    """
+    Read the first page of the table found at xpath, like
+    read_table(driver).row('Name', 'sda')['Pool'].
+    """
+    return Table(driver, xpath, max_pages).load()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+import os
+import requests
+import time
+import xpaths
+from api_client import RestClient
+from function import wait_on_element
+from urllib.parse import urlparse
+
+# the token of auth.service.ts is an ngx-webstorage @LocalStorage() value,
+# saved as JSON under "<prefix>|<lowercase key>"
+TOKEN_KEY = 'ngx-webstorage|token'
+
+# the sign-in page logs in with the token and opens redirectUrl
+INJECT_SCRIPT = """
+localStorage.setItem(arguments[0], JSON.stringify(arguments[1]));
+sessionStorage.setItem('redirectUrl', arguments[2]);
+"""
+
+# a client per host without the retries of api_client, generate_token does
+# its own short retries
+clients = {}
+
+
+def use_token_login():
+    # LOGIN_MODE=ui fill the sign-in form for every login like before, a
+    # DOM replay has no API to get a token from
+    return os.environ.get('LOGIN_MODE') != 'ui' and os.environ.get('DOM_SNAPSHOTS') != 'replay'
+
+
+def generate_token(host, auth, ttl=600, timeout=20):
+    """
+    Return a token of auth.generate_token or None. Connection errors and 5xx
+    answers like right after a failover are retried for timeout seconds, a
+    4xx like bad credentials returns None at once.
+    """
+    if host not in clients:
+        clients[host] = RestClient(host, timeout=(2, 10), retries=0)
+    deadline = time.time() + timeout
+    while True:
+        try:
+            results = clients[host].post('auth/generate_token/', auth, {'ttl': ttl, 'attrs': {}})
+            if results.status_code == 200:
+                return results.json()
+            if results.status_code < 500:
+                return None
+        except (requests.RequestException, ValueError):
+            pass
+        if time.time() >= deadline:
+            return None
+        time.sleep(1)
+
+
+def token_login(driver, auth, host=None, route='/dashboard', timeout=60):
+    """
+    Log in the web UI of host, the host of the current page by default,
+    with an API token instead of the sign-in form and open route.
+    Return True once the side menu is there.
+    """
+    host = host or urlparse(driver.current_url).netloc
+    token = generate_token(host, auth)
+    if token is None:
+        return False
+    # the storage belongs to the origin of the page
+    if urlparse(driver.current_url).netloc != host:
+        driver.get(f'http://{host}/ui/sessions/signin')
+    driver.execute_script(INJECT_SCRIPT, TOKEN_KEY, token, route)
+    driver.get(f'http://{host}/ui{route}')
+    return wait_on_element(driver, timeout, xpaths.side_Menu.dashboard)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import pytest
+from dom_probe import find_if_present, is_present, probe_stats
+from replay_driver import ReplayDriver
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+PAGE = '<html><body><div id="pool">tank</div></body></html>'
+
+
+class StaleDriver:
+    """
+    The in-browser find hits an element of the page that was replaced, the
+    lookup falls back to find_element_by_xpath on the new page.
+    """
+
+    def __init__(self, elements):
+        self.elements = elements
+        self.lookups = []
+
+    def execute_script(self, script, *arguments):
+        raise StaleElementReferenceException('stale element reference')
+
+    def find_element_by_xpath(self, xpath):
+        self.lookups.append(xpath)
+        if xpath not in self.elements:
+            raise NoSuchElementException(xpath)
+        return self.elements[xpath]
+
+
+@pytest.fixture
+def page(tmp_path):
+    path = tmp_path / 'page.html'
+    path.write_text(PAGE)
+    return ReplayDriver([str(path)])
+
+
+@pytest.fixture(autouse=True)
+def stats(monkeypatch):
+    monkeypatch.delenv('PRESENCE_PROBE', raising=False)
+    for key in probe_stats:
+        monkeypatch.setitem(probe_stats, key, 0)
+    return probe_stats
+
+
+def test_present(page, stats):
+    element = find_if_present(page, '//div[@id="pool"]')
+    assert element.text == 'tank'
+    assert is_present(page, '//div[@id="pool"]')
+    assert stats['probes'] == 2 and stats['absent'] == 0
+
+
+def test_absent_skips_the_implicit_wait(page, stats):
+    assert find_if_present(page, '//div[@id="dataset"]') is None
+    assert not is_present(page, '//div[@id="dataset"]')
+    assert stats['absent'] == 2 and stats['skipped_waits'] == 2
+    assert stats['implicit_wait_seconds'] == 0
+
+
+def test_stale_element_falls_back_to_the_implicit_wait(stats):
+    driver = StaleDriver({'//div[@id="pool"]': 'tank'})
+    assert find_if_present(driver, '//div[@id="pool"]') == 'tank'
+    assert not is_present(driver, '//div[@id="dataset"]')
+    assert driver.lookups == ['//div[@id="pool"]', '//div[@id="dataset"]']
+    assert stats['absent'] == 1 and stats['skipped_waits'] == 0
+
+
+def test_implicit_mode(page, stats, monkeypatch):
+    monkeypatch.setenv('PRESENCE_PROBE', 'implicit')
+    assert is_present(page, '//div[@id="pool"]')
+    assert not is_present(page, '//div[@id="dataset"]')
+    assert stats['absent'] == 1 and stats['skipped_waits'] == 0
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+import os
+import pytest
+import shutil
+import time
+from dom_wait import wait_for_xpath
+from replay_driver import ReplayDriver
+from selenium.common.exceptions import JavascriptException, StaleElementReferenceException
+
+# the element is added and the other one removed 300 ms after the load
+PAGE = """
+<html><body>
+<div id="leaving">leaving</div>
+<script>
+setTimeout(function () {
+    var late = document.createElement('div');
+    late.id = 'late';
+    late.textContent = 'late';
+    document.body.appendChild(late);
+    document.getElementById('leaving').remove();
+}, 300);
+</script>
+</body></html>
+"""
+
+
+def write_pages(directory, *bodies):
+    paths = []
+    for index, body in enumerate(bodies):
+        path = directory / f'page_{index}.html'
+        path.write_text(f'<html><body>{body}</body></html>')
+        paths.append(str(path))
+    return paths
+
+
+class TransientDriver:
+    """
+    Raise error on the first calls of the wait script, then answer True.
+    """
+
+    def __init__(self, error, failures):
+        self.error = error
+        self.failures = failures
+        self.calls = 0
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *arguments):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return True
+
+
+def test_replay_element_appears(tmp_path):
+    driver = ReplayDriver(write_pages(tmp_path, '', '<div id="late">late</div>'))
+    assert wait_for_xpath(driver, 5, '//div[@id="late"]')
+
+
+def test_replay_element_goes_away(tmp_path):
+    driver = ReplayDriver(write_pages(tmp_path, '<div id="leaving">leaving</div>', ''))
+    assert wait_for_xpath(driver, 5, '//div[@id="leaving"]', 'gone')
+
+
+def test_replay_element_never_appears(tmp_path):
+    driver = ReplayDriver(write_pages(tmp_path, '', '<div id="late">late</div>'))
+    assert not wait_for_xpath(driver, 5, '//div[@id="never"]')
+
+
+def test_unloaded_page_is_waited_again():
+    driver = TransientDriver(StaleElementReferenceException('stale'), 2)
+    assert wait_for_xpath(driver, 5, '//div[@id="late"]')
+    assert driver.calls == 3
+
+
+def test_unloaded_page_until_the_deadline():
+    driver = TransientDriver(JavascriptException('Document was unloaded'), 1000)
+    start = time.time()
+    assert not wait_for_xpath(driver, 0.5, '//div[@id="late"]')
+    assert time.time() - start < 2
+
+
+def test_broken_script_is_raised():
+    driver = TransientDriver(JavascriptException('SyntaxError: missing )'), 1)
+    with pytest.raises(JavascriptException):
+        wait_for_xpath(driver, 5, '//div[@id="late"]')
+
+
+@pytest.fixture(scope='module')
+def firefox(tmp_path_factory):
+    # WAIT_SCRIPT itself only runs in a browser
+    if shutil.which('geckodriver') is None or not (shutil.which('firefox') or os.path.exists('/usr/local/bin/firefox')):
+        pytest.skip('firefox and geckodriver are needed')
+    from selenium import webdriver
+    from selenium.webdriver.firefox.options import Options
+    options = Options()
+    options.add_argument('-headless')
+    web_driver = webdriver.Firefox(options=options)
+    page = tmp_path_factory.mktemp('dom_wait') / 'page.html'
+    page.write_text(PAGE)
+    web_driver.page = page.as_uri()
+    yield web_driver
+    web_driver.quit()
+
+
+def test_firefox_element_appears(firefox):
+    firefox.get(firefox.page)
+    assert wait_for_xpath(firefox, 5, '//div[@id="late"]')
+
+
+def test_firefox_element_goes_away(firefox):
+    firefox.get(firefox.page)
+    assert wait_for_xpath(firefox, 5, '//div[@id="leaving"]', 'gone')
+
+
+def test_firefox_element_never_appears(firefox):
+    firefox.get(firefox.page)
+    start = time.time()
+    assert not wait_for_xpath(firefox, 1, '//div[@id="never"]')
+    assert 1 <= time.time() - start < 5
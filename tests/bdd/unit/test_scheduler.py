@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+from scheduler import dependency_chains, dependency_graph, schedule_workers
+
+SETUP = """
+import pytest
+
+@pytest.mark.dependency(name='Setup_HA', scope='session')
+def test_setup():
+    pass
+"""
+
+TEST = """
+import pytest
+from pytest_dependency import depends
+{mark}
+
+@pytest.mark.dependency(name='{name}', scope='session')
+def test_{name}(request):
+    depends(request, {needs}, scope='session')
+"""
+
+
+def write_tests(directory, tests):
+    files = {}
+    for name, (needs, exclusive) in tests.items():
+        mark = 'pytestmark = [pytest.mark.exclusive]' if exclusive else ''
+        path = directory / f'test_{name}.py'
+        path.write_text(TEST.format(mark=mark, name=name, needs=needs))
+        files[name] = str(path)
+    return files
+
+
+def test_exclusive_chains_are_never_on_the_workers(tmp_path):
+    # the failovers of the ha-bhyve02 chains with independent tests around
+    files = write_tests(tmp_path, {
+        'System_Dataset': (['Setup_HA'], True),
+        'Failover_Dataset': (['System_Dataset'], True),
+        'NFS_Failover': (['Setup_HA'], True),
+        'SMB_Failover': (['Setup_HA'], True),
+        'Degraded_Alert': (['Setup_HA'], True),
+        'Users': (['Setup_HA'], False),
+        'Groups': (['Users'], False),
+        'Network': (['Setup_HA'], False),
+        'Services': (['Setup_HA'], False)
+    })
+    graph = dependency_graph(list(files.values()))
+    shards, exclusive = schedule_workers(dependency_chains(graph), 4)
+    exclusive_files = {files[name] for name in ('System_Dataset', 'Failover_Dataset', 'NFS_Failover', 'SMB_Failover', 'Degraded_Alert')}
+    for shard in shards:
+        assert not set(shard) & exclusive_files
+    assert set(exclusive) == exclusive_files
+    assert exclusive.index(files['System_Dataset']) < exclusive.index(files['Failover_Dataset'])
+    assert sorted(test_file for shard in shards for test_file in shard) == sorted(set(files.values()) - exclusive_files)
+
+
+def test_a_chain_with_an_exclusive_test_stays_together(tmp_path):
+    files = write_tests(tmp_path, {
+        'Pool': ([], False),
+        'Pool_Failover': (['Pool'], True),
+        'Shares': ([], False)
+    })
+    graph = dependency_graph(list(files.values()))
+    shards, exclusive = schedule_workers(dependency_chains(graph), 2)
+    assert exclusive == [files['Pool'], files['Pool_Failover']]
+    assert shards == [[files['Shares']]]
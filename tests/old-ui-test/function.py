@@ -133,6 +133,22 @@ def status_change(driver, which):
         time.sleep(2)
 
 
+# 1-based index of the datatable-row-wrapper under arguments[0] with the
+# text arguments[1] in its first cell, 0 when there is none.
+row_index_script = """
+const rows = document.evaluate(arguments[0] + '/datatable-row-wrapper', document, null,
+                               XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (let index = 0; index < rows.snapshotLength; index++) {
+  const cell = document.evaluate('datatable-body-row/div[2]/datatable-body-cell[1]', rows.snapshotItem(index), null,
+                                 XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  if (cell && cell.innerText.trim() === arguments[1]) {
+    return index + 1;
+  }
+}
+return 0;
+"""
+
+
 def plugin_install(driver, action, name):
     # the convention is set in such a way that a single function can cleanup
     # both type:user/group, name:name of the group or user path plugs in
@@ -154,17 +170,9 @@ def plugin_install(driver, action, name):
     driver.find_element_by_xpath(xpaths['submenu' + path]).click()
     # wait till the list is loaded
     time.sleep(2)
-    index = 1
-    ui_text = "null"
-    for x in range(0, 33):
-        if is_element_present(driver, '//*[@id="entity-table-component"]/div[' + str(num) + ']/ngx-datatable/div/datatable-body/datatable-selection/datatable-scroller/datatable-row-wrapper[' + str(x) + ']/datatable-body-row/div[2]/datatable-body-cell[1]/div/div'):
-            ui_element= driver.find_element_by_xpath('//*[@id="entity-table-component"]/div[' + str(num) + ']/ngx-datatable/div/datatable-body/datatable-selection/datatable-scroller/datatable-row-wrapper[' + str(x) + ']/datatable-body-row/div[2]/datatable-body-cell[1]/div/div')
-            ui_text = ui_element.text
-            print(ui_text)
-        if (ui_text == name):
-            index = x
-            break
-        ui_element = " "
+    # read the first cell of every row in one call instead of two per row
+    table = '//*[@id="entity-table-component"]/div[' + str(num) + ']/ngx-datatable/div/datatable-body/datatable-selection/datatable-scroller'
+    x = driver.execute_script(row_index_script, table, name)
     print("index, delNum, num: " + str(x) + ", " + str(delNum) + "," + str(num))
     time.sleep(1)
     # click on the 3 dots